@@ -1,15 +1,202 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Blueprint, Flask, Response, current_app, g, render_template, request, jsonify, session
 # Assuming your solver functions are in solver_logic.py
 from solver_logic import (
-    load_past_words as solver_load_past_words,
-    load_words as solver_load_words, # This should accept past_words_to_exclude
-    filter_words as solver_filter_words,
-    suggest_next_guess as solver_suggest_next_guess
+    get_dictionary,
+    get_dictionary_words,                    # Cached per process, reloaded on mtime change
+    get_dictionary_index,                    # Bitset index over a dictionary's full word list
+    load_dictionaries,
+    WordListWatcher,                         # Publishes word list snapshots, reloaded in the background
+    DEFAULT_DICTIONARY,
+    DICTIONARIES,
+    Constraints,
+    apply_feedback_multi,
+    filter_batch as solver_filter_batch,
+    iter_candidates as solver_iter_candidates,
+    suggest_next_guess as solver_suggest_next_guess,
+    suggest_multi_board as solver_suggest_multi_board,
+    suggestion_cache_info,
+    ENTROPY_TIME_BUDGET,
+    validate_history,
+    word_list_digest,
+    np
 )
+from game_store import create_game_store, new_game_id
+from opening_book import load_opening_book, lookup_opening
+from suggestion_pool import SuggestionPool
+from itertools import islice
+import compression
+import hashlib
+import metrics
+import os
 import random
+import time
 
-app = Flask(__name__)
-app.secret_key = 'your_very_secret_key_for_sessions_CHANGE_ME'
+bp = Blueprint('wordle', __name__)
+
+def create_app(config=None):
+    """Application factory; see wsgi.py for the production entry point."""
+    app = Flask(__name__)
+    app.secret_key = 'your_very_secret_key_for_sessions_CHANGE_ME'
+
+    # Game state lives server-side; the session cookie only carries 'game_id'.
+    # WORDLE_GAME_STORE=sqlite shares state between worker processes via a SQLite file.
+    app.config['GAME_STORE'] = os.environ.get('WORDLE_GAME_STORE', 'memory')
+    app.config['GAME_STORE_PATH'] = os.environ.get('WORDLE_GAME_STORE_PATH', 'game_state.sqlite3')
+    # Guess scoring used for suggestions: "frequency" (default), "entropy", "minimax"
+    # or "optimal" (the decision tree built by decision_tree.py)
+    app.config['SUGGESTION_STRATEGY'] = os.environ.get('WORDLE_STRATEGY', 'frequency')
+    # Expensive strategies run in a process pool; requests wait at most this many
+    # seconds before answering with the frequency heuristic (0 workers = run inline)
+    app.config['SUGGESTION_WORKERS'] = int(os.environ.get('WORDLE_SUGGESTION_WORKERS', 2))
+    app.config['SUGGESTION_TIMEOUT'] = float(os.environ.get('WORDLE_SUGGESTION_TIMEOUT', 0.25))
+    # Seconds /api/solve_batch may spend on the configured strategy per request; the
+    # remaining games get the frequency heuristic
+    app.config['BATCH_TIME_BUDGET'] = float(os.environ.get('WORDLE_BATCH_TIME_BUDGET', 1.0))
+    # Latency/candidate-count/cache metrics, served in Prometheus format at /metrics
+    app.config['METRICS'] = os.environ.get('WORDLE_METRICS', '1') != '0'
+    # Seconds between checks for changed word files (e.g. the daily past_used_words.txt
+    # update); new games pick up the rebuilt lists without a restart. 0 = never reload.
+    app.config['WORD_LIST_RELOAD_INTERVAL'] = float(os.environ.get('WORDLE_RELOAD_INTERVAL', 30))
+    # gzip (or brotli, if installed) for HTML, JSON and static assets; off when a proxy compresses
+    app.config['COMPRESS'] = os.environ.get('WORDLE_COMPRESS', '1') != '0'
+    # Seconds browsers may cache static/css and static/js; their URLs change with the files
+    app.config['STATIC_MAX_AGE'] = int(os.environ.get('WORDLE_STATIC_MAX_AGE', 365 * 24 * 60 * 60))
+    if config:
+        app.config.update(config)
+
+    # Extra dictionaries (other lists, word lengths, languages) come from dictionaries.json;
+    # their indexes are only built when a game first uses them.
+    load_dictionaries()
+
+    if app.config['GAME_STORE'] == 'sqlite':
+        game_store = create_game_store('sqlite', path=app.config['GAME_STORE_PATH'])
+    else:
+        game_store = create_game_store('memory')
+    app.extensions['wordle'] = {
+        'game_store': game_store,
+        # Built offline by opening_book.py; loaded once so early-game suggestions are lookups
+        'opening_book': load_opening_book(),
+        'suggestion_pool': SuggestionPool(app.config['SUGGESTION_WORKERS'], app.config['SUGGESTION_TIMEOUT']),
+        'word_lists': WordListWatcher(app.config['WORD_LIST_RELOAD_INTERVAL'])
+    }
+    metrics.enable(app.config['METRICS'])
+    word_lists = app.extensions['wordle']['word_lists']
+    metrics.REGISTRY.gauge('word_list_version', lambda: word_lists.snapshot.version if word_lists.snapshot else 0,
+                           'Version of the word list snapshot serving new games')
+    metrics.REGISTRY.gauge('word_list_age_seconds',
+                           lambda: time.time() - word_lists.snapshot.created_at if word_lists.snapshot else 0,
+                           'Seconds since the word list snapshot serving new games was built')
+    app.register_blueprint(bp)
+    return app
+
+def preload_word_indexes(pattern_matrices=True):
+    """
+    Builds every dictionary's word lists and index (and memory-maps the pattern
+    matrices) up front. Call before forking workers so they share it all copy-on-write.
+    """
+    load_dictionaries()
+    for name in DICTIONARIES:
+        get_dictionary_words(name, exclude_past=False)
+        get_dictionary_words(name, exclude_past=True)
+        index = get_dictionary_index(name)
+        if np is not None:
+            index.letter_array()
+            if pattern_matrices:
+                index.pattern_matrix()
+
+def _cache_stat(key):
+    return lambda: suggestion_cache_info()[key]
+
+def _cache_hit_ratio():
+    info = suggestion_cache_info()
+    lookups = info['hits'] + info['misses']
+    return info['hits'] / lookups if lookups else 0.0
+
+metrics.REGISTRY.gauge('suggestion_cache_hits', _cache_stat('hits'), 'Suggestion cache hits since start')
+metrics.REGISTRY.gauge('suggestion_cache_misses', _cache_stat('misses'), 'Suggestion cache misses since start')
+metrics.REGISTRY.gauge('suggestion_cache_size', _cache_stat('size'), 'Entries in the suggestion cache')
+metrics.REGISTRY.gauge('suggestion_cache_hit_ratio', _cache_hit_ratio, 'Suggestion cache hits / lookups')
+metrics.REGISTRY.describe('request_seconds', 'Request latency by route')
+metrics.REGISTRY.describe('suggest_seconds', 'suggest_next_guess wall time')
+metrics.REGISTRY.describe('suggest_candidates', 'Candidate count per suggestion, by strategy')
+metrics.REGISTRY.describe('game_candidates', 'Candidates left after each submitted guess, by guess number')
+metrics.REGISTRY.describe('state_bytes', 'Serialized game state size')
+metrics.REGISTRY.describe('compressed_responses', 'Responses compressed, by encoding')
+metrics.REGISTRY.describe('compression_saved_bytes', 'Response bytes saved by compression')
+metrics.REGISTRY.describe('batch_budget_fallbacks', 'Batch games answered with the frequency heuristic after the time budget ran out')
+metrics.REGISTRY.describe('not_modified_responses', 'Conditional requests answered with 304, by route')
+
+@bp.before_app_request
+def _start_request_timer():
+    if metrics.REGISTRY.enabled:
+        g.request_started = time.perf_counter()
+
+@bp.after_app_request
+def _record_request_time(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe('request_seconds', time.perf_counter() - started,
+                        route=route, method=request.method, status=response.status_code)
+    return response
+
+# --- Response caching ---
+# Static files are linked with a ?v=<mtime> version (see _static_url_version),
+# so those URLs can be cached for good and a changed file gets a new URL.
+# GET views of a game carry a weak ETag built from the game id and the state's
+# version, which save_game_state bumps; a matching If-None-Match is answered
+# with 304 before any suggestion, template or JSON is built. They are private
+# to the session and revalidated on every use.
+
+@bp.app_url_defaults
+def _static_url_version(endpoint, values):
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        try:
+            mtime = os.stat(os.path.join(current_app.static_folder, values['filename'])).st_mtime
+        except OSError:
+            return
+        values['v'] = format(int(mtime), 'x')
+
+@bp.after_app_request
+def _finish_response(response):
+    # Registered after the request timer, so it runs first and is timed with the rest
+    is_static = request.endpoint == 'static'
+    if is_static and request.args.get('v'):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config['STATIC_MAX_AGE']
+        response.cache_control.immutable = True
+    if current_app.config['COMPRESS']:
+        compression.compress_response(response, request.accept_encodings, cache=is_static)
+    return response
+
+def state_etag(state, session_key='game_id', *parts):
+    """ETag for a view of a game state; parts are whatever else the view depends on (e.g. query arguments)."""
+    key = repr((session.get(session_key), state.get('version', 0), current_app.config['SUGGESTION_STRATEGY'], parts))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+def not_modified(etag):
+    """A 304 response if the client's If-None-Match already has etag, else None."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    metrics.inc('not_modified_responses', route=request.url_rule.rule)
+    return with_etag(Response(status=304), etag)
+
+def with_etag(response, etag):
+    """Marks a game view response as private and revalidated, with etag unless its suggestion was provisional."""
+    if not g.get('provisional_suggestion'):
+        response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
+def _mark_provisional_suggestion():
+    # A stand-in answer while the worker pool finishes; don't let clients keep it
+    g.provisional_suggestion = True
+
+def get_game_store():
+    return current_app.extensions['wordle']['game_store']
 
 # --- Helper to get word list info string ---
 def get_word_list_info_text(current_word_list_size, total_raw_word_count, past_words_excluded_count, is_excluding):
@@ -22,178 +209,501 @@ def get_word_list_info_text(current_word_list_size, total_raw_word_count, past_w
         return f"{current_word_list_size} words from {total_raw_word_count} (all words included)"
 
 # --- Game State Initialization and Management ---
-def initialize_game_session(exclude_past_setting):
-    """Initializes or re-initializes the game state in the session."""
-    session['exclude_past_words'] = exclude_past_setting
-    
-    # Load all raw words once to get a base count (if not already done)
-    # This assumes solver_load_words with no exclusion returns the full list from words.txt
-    all_raw_words_from_file = solver_load_words(filename="words.txt", past_words_to_exclude=set())
-    session['total_raw_word_count'] = len(all_raw_words_from_file)
-
-    past_words_to_exclude_set = set()
-    if exclude_past_setting:
-        past_words_from_file = solver_load_past_words() # This should just return the set
-        if past_words_from_file:
-            past_words_to_exclude_set = past_words_from_file
-    
-    session['past_words_loaded_count'] = len(past_words_to_exclude_set)
+def get_word_lists():
+    """The current word list snapshot; rebuilt in the background when the files change."""
+    return current_app.extensions['wordle']['word_lists'].current()
 
-    # Load the actual game word list based on the setting
-    game_word_list = solver_load_words(filename="words.txt", past_words_to_exclude=past_words_to_exclude_set)
-    
-    session['all_words_for_current_game'] = game_word_list # The active list
-    session['possible_words'] = list(game_word_list)
-    session['known_letters'] = [None] * 5
-    session['present_letters'] = [] 
-    session['absent_letters'] = []  
-    session['yellow_misplaced'] = [[] for _ in range(5)] 
-    session['guess_number'] = 1
-    session['game_over'] = False
-    session['solved'] = False
-    session.modified = True
-
-def get_current_game_data_for_frontend():
-    """Prepares data from session to send to the frontend."""
-    possible_words = session.get('possible_words', [])
-    known_letters = session.get('known_letters', [None]*5)
-    present_letters_list = session.get('present_letters', []) # Already stored as sorted list
-    absent_letters_list = session.get('absent_letters', [])   # Already stored as sorted list
+def get_base_index(state):
+    """
+    The WordIndex over the game's full dictionary; candidate bitmasks in game
+    state index into it. None once that index is no longer retained.
+    """
+    # The index the game started on, even if a newer snapshot has replaced it since
+    return current_app.extensions['wordle']['word_lists'].index_for(state['dictionary'], state.get('index_digest'))
+
+GAME_RESTARTED_MESSAGE = "The word list was updated, so a new game was started. Please enter your guesses again."
+
+def initialize_game_state(exclude_past_setting, dictionary_name=DEFAULT_DICTIONARY, hard_mode=False):
+    """Creates a new game in the store and points the session at it."""
+    # Everything comes from the current snapshot, so a reset never does file I/O;
+    # the game keeps its own candidate bitmask, so later reloads don't affect it.
+    dictionary = get_dictionary(dictionary_name)
+    word_lists = get_word_lists()
+    index = word_lists.index(dictionary_name)
+    game_word_list = word_lists.words(dictionary_name, exclude_past=exclude_past_setting)
+
+    state = {
+        'dictionary': dictionary_name,
+        'word_length': dictionary['word_length'],
+        'hard_mode': hard_mode,
+        'exclude_past_words': exclude_past_setting,
+        'total_raw_word_count': len(index),
+        'past_words_loaded_count': len(word_lists.past_words(dictionary_name)) if exclude_past_setting else 0,
+        'game_word_count': len(game_word_list), # Size of the active list
+        'word_list_digest': word_list_digest(game_word_list), # Selects the opening book
+        'word_list_version': word_lists.version,
+        'index_digest': index.digest,
+        'history': [], # [guess, feedback] pairs played so far
+        'candidates': index.mask_for(game_word_list),
+        'constraints': Constraints(dictionary['word_length']).to_bytes().hex(), # Everything learned from feedback so far
+        'guess_number': 1,
+        'game_over': False,
+        'solved': False
+    }
+    game_id = new_game_id()
+    # Drop the previous game so resets don't leave orphans behind until TTL expiry
+    if 'game_id' in session:
+        get_game_store().delete(session['game_id'])
+    session['game_id'] = game_id
+    get_game_store().put(game_id, state)
+    return state
+
+def get_game_state():
+    """Returns the current game state, starting a new game if there is none (or it expired)."""
+    state = get_game_store().get(session['game_id']) if 'game_id' in session else None
+    if state is None:
+        state = initialize_game_state(True) # Default to True
+    elif get_base_index(state) is None:
+        # The words file changed and the game's index aged out; its bitmasks can't be decoded
+        state = initialize_game_state(state['exclude_past_words'], state['dictionary'], state['hard_mode'])
+        g.game_restarted = True
+    return state
+
+def save_game_state(state, session_key='game_id'):
+    state['version'] = state.get('version', 0) + 1  # Invalidates ETags of earlier views
+    get_game_store().put(session[session_key], state)
+
+def suggest_for_state(state, possible_words):
+    """Live suggestion for a game, honouring its dictionary and hard mode setting."""
+    # Offloaded to the worker pool (with a deadline) for expensive strategies
+    return current_app.extensions['wordle']['suggestion_pool'].suggest(
+        state['dictionary'],
+        get_base_index(state),
+        possible_words,
+        state['candidates'],
+        current_app.config['SUGGESTION_STRATEGY'],
+        state['hard_mode'],
+        on_fallback=_mark_provisional_suggestion
+    )
+
+def get_current_game_data_for_frontend(state):
+    """Prepares data from the game state to send to the frontend."""
+    possible_words = get_base_index(state).words_for(state['candidates'])
+    constraints = Constraints.from_bytes(bytes.fromhex(state['constraints']))
+    known_letters = constraints.known_letters()
+    present_letters_list = constraints.present_letters() # Sorted
+    absent_letters_list = constraints.absent_letters()   # Sorted
     
-    current_exclude_setting = session.get('exclude_past_words', True)
-    total_raw_count = session.get('total_raw_word_count', 0)
-    past_loaded_count = session.get('past_words_loaded_count', 0) # Count of words *actually* used for exclusion
+    current_exclude_setting = state['exclude_past_words']
+    total_raw_count = state['total_raw_word_count']
+    past_loaded_count = state['past_words_loaded_count'] # Count of words *actually* used for exclusion
 
     # Calculate effective number of words used for exclusion based on current list
     # This can be tricky if the main list itself is smaller than the past words list.
     # For simplicity, past_loaded_count is the number of words in past_used_words.txt
     
     word_list_info = get_word_list_info_text(
-        len(session.get('all_words_for_current_game', [])), # Use the size of the actual list loaded for the game
+        state['game_word_count'], # Use the size of the actual list loaded for the game
         total_raw_count,
         past_loaded_count if current_exclude_setting else 0, # Only show excluded count if setting is on
         current_exclude_setting
     )
     
-    # Get a suggestion
+    # Get a suggestion, from the opening book when it covers this position
+    # ("optimal" follows its own decision tree from the first guess on). The
+    # book is built without hard mode, so its guesses may not be candidates.
+    plays_tree = current_app.config['SUGGESTION_STRATEGY'] == 'optimal'
+    suggested = None
+    if not plays_tree and not state['hard_mode']:
+        suggested = lookup_opening(current_app.extensions['wordle']['opening_book'], state['word_list_digest'], state['history'])
+        metrics.inc('opening_book_lookups', result='miss' if suggested is None else 'hit')
     starters = ["crane", "slate", "soare", "adieu", "trace"]
     valid_starters = [s for s in starters if s in possible_words] # Suggest from current possible_words
-    if session.get('guess_number', 1) == 1:
+    if suggested is not None:
+        pass # Book hit, no live scoring needed
+    elif state['guess_number'] == 1 and not plays_tree:
         if valid_starters:
             suggested = random.choice(valid_starters)
         elif possible_words:
-            suggested = solver_suggest_next_guess(possible_words)
+            suggested = suggest_for_state(state, possible_words)
         else:
             suggested = "N/A"
     else:
-        suggested = solver_suggest_next_guess(possible_words) if possible_words else "N/A"
+        suggested = suggest_for_state(state, possible_words) if possible_words else "N/A"
 
 
     return {
         "suggested_guess": suggested.upper() if suggested else "N/A",
         "possible_words_count": len(possible_words),
-        "possible_words_sample": sorted(possible_words[:200]),
-        "guess_number": session.get('guess_number', 1),
+        "guess_number": state['guess_number'],
         "known_letters_display": "".join([l.upper() if l else "_" for l in known_letters]),
         "present_letters_display": ", ".join(present_letters_list) if present_letters_list else "None",
         "absent_letters_display": ", ".join(absent_letters_list) if absent_letters_list else "None",
-        "game_over": session.get('game_over', False),
-        "solved": session.get('solved', False),
+        "game_over": state['game_over'],
+        "solved": state['solved'],
         "exclude_past_words_setting": current_exclude_setting,
+        "hard_mode_setting": state['hard_mode'],
+        "dictionary": state['dictionary'],
+        "word_length": state['word_length'],
         "word_list_info": word_list_info
     }
 
-@app.route('/')
+@bp.route('/')
 def index():
-    # Initialize game session if it's a new session or if forced by a flag
-    if 'possible_words' not in session: # Simplistic check for new session
-        initialize_game_session(session.get('exclude_past_words', True)) # Default to True
+    # get_game_state starts a new game for new sessions
+    state = get_game_state()
+    etag = state_etag(state)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     
     # Always get current data to render template
-    template_data = get_current_game_data_for_frontend()
-    return render_template('index.html', **template_data)
+    template_data = get_current_game_data_for_frontend(state)
+    template_data['dictionaries'] = [(name, options['label']) for name, options in DICTIONARIES.items()]
+    # JSON responses leave the word list to /api/candidates; the first page is rendered inline
+    template_data['possible_words_sample'] = list(islice(
+        solver_iter_candidates(get_base_index(state), state['candidates'], "alpha"), CANDIDATES_PAGE_SIZE
+    ))
+    return with_etag(current_app.make_response(render_template('index.html', **template_data)), etag)
 
-@app.route('/submit_guess', methods=['POST'])
+@bp.route('/submit_guess', methods=['POST'])
 def submit_guess_route():
-    if 'possible_words' not in session: # Game not initialized
-        initialize_game_session(session.get('exclude_past_words', True))
+    state = get_game_state()
 
     data = request.get_json()
     user_guess = data.get('guess', '').lower()
     feedback_colors = data.get('feedback', '')
 
-    current_exclude_setting = session.get('exclude_past_words', True) # Get current setting
-
-    if session.get('game_over', False) or session.get('solved', False):
+    if g.get('game_restarted'):
+        return jsonify({"error": GAME_RESTARTED_MESSAGE, **get_current_game_data_for_frontend(state)})
+    if state['game_over'] or state['solved']:
         return jsonify({
-            "error": "Game is over.", "game_over": session['game_over'], "solved": session['solved'],
-            **get_current_game_data_for_frontend() # Send current state
+            "error": "Game is over.", "game_over": state['game_over'], "solved": state['solved'],
+            **get_current_game_data_for_frontend(state) # Send current state
         })
 
-    if not user_guess or len(user_guess) != 5 or not user_guess.isalpha():
-        return jsonify({"error": "Invalid guess.", **get_current_game_data_for_frontend()})
-    if not feedback_colors or len(feedback_colors) != 5 or not all(c in "GYX" for c in feedback_colors):
-        return jsonify({"error": "Invalid feedback string.", **get_current_game_data_for_frontend()})
-
-    # Retrieve current game state from session
-    possible_words = list(session['possible_words']) # Work with copies for filtering
-    known_letters = list(session['known_letters'])
-    present_letters_set = set(session['present_letters'])
-    absent_letters_set = set(session['absent_letters'])
-    yellow_misplaced_sets = [set(ym) for ym in session['yellow_misplaced']]
-    guess_number = session['guess_number']
-
-    if feedback_colors == "GGGGG":
-        session['solved'] = True
-        session['game_over'] = True
-        session.modified = True
-        response_data = get_current_game_data_for_frontend()
+    word_length = state['word_length']
+    if not user_guess or len(user_guess) != word_length or not user_guess.isascii() or not user_guess.isalpha():
+        return jsonify({"error": "Invalid guess.", **get_current_game_data_for_frontend(state)})
+    if not feedback_colors or len(feedback_colors) != word_length or not all(c in "GYX" for c in feedback_colors):
+        return jsonify({"error": "Invalid feedback string.", **get_current_game_data_for_frontend(state)})
+
+    constraints = Constraints.from_bytes(bytes.fromhex(state['constraints']))
+    guess_number = state['guess_number']
+
+    if feedback_colors == "G" * word_length:
+        state['solved'] = True
+        state['game_over'] = True
+        save_game_state(state)
+        response_data = get_current_game_data_for_frontend(state)
         response_data["message"] = f"Congratulations! You found the word: {user_guess.upper()}"
         response_data["final_guess"] = user_guess.upper()
         return jsonify(response_data)
 
-    # Call your existing filter_words logic
-    # Ensure filter_words correctly updates the passed-in lists/sets or returns new ones
-    # The provided solver_filter_words modifies them in place.
-    new_possible_words = solver_filter_words(
-        possible_words, # This is already a copy from session['possible_words']
-        user_guess,
-        feedback_colors,
-        known_letters,      # This is a copy, will be modified
-        present_letters_set, # This is a copy, will be modified
-        absent_letters_set,  # This is a copy, will be modified
-        yellow_misplaced_sets # This is a copy, will be modified
-    )
+    # Same semantics as solver_logic.filter_words: merge the feedback into the
+    # constraints and compile them into a bitset query on the stored candidate
+    # bitmask, so no word lists are built for the filtering.
+    constraints.merge(user_guess, feedback_colors)
+    new_candidates = constraints.compile(get_base_index(state), state['candidates'])
     
     guess_number += 1
-    session['guess_number'] = guess_number
-    session['possible_words'] = new_possible_words
-    session['known_letters'] = known_letters 
-    session['present_letters'] = sorted(list(present_letters_set))
-    session['absent_letters'] = sorted(list(absent_letters_set))
-    session['yellow_misplaced'] = [sorted(list(ym_set)) for ym_set in yellow_misplaced_sets]
-
-    if guess_number > 6 and not session['solved']:
-        session['game_over'] = True
+    state['guess_number'] = guess_number
+    state['candidates'] = new_candidates
+    state['history'].append([user_guess, feedback_colors])
+    state['constraints'] = constraints.to_bytes().hex()
+    metrics.observe('game_candidates', get_base_index(state).count(new_candidates), guess_number=guess_number - 1)
+
+    if guess_number > 6 and not state['solved']:
+        state['game_over'] = True
     
-    session.modified = True
+    save_game_state(state)
     
-    response_data = get_current_game_data_for_frontend()
-    if not new_possible_words and not session['solved']:
+    response_data = get_current_game_data_for_frontend(state)
+    if not new_candidates and not state['solved']:
         response_data["error"] = "No possible words left. Check feedback or word not in list."
     return jsonify(response_data)
 
 
-@app.route('/reset_game', methods=['POST'])
+@bp.route('/reset_game', methods=['POST'])
 def reset_game_route():
     data = request.get_json()
     new_exclude_setting = data.get('exclude_past_words', True) # Get from JS
+    dictionary_name = data.get('dictionary', DEFAULT_DICTIONARY)
+    if not isinstance(dictionary_name, str) or dictionary_name not in DICTIONARIES:
+        return jsonify({"error": f"Unknown dictionary: {dictionary_name}"}), 400
     
-    initialize_game_session(new_exclude_setting) # Re-initialize with the new setting
+    # Re-initialize with the new settings
+    state = initialize_game_state(new_exclude_setting, dictionary_name, bool(data.get('hard_mode', False)))
     
-    response_data = get_current_game_data_for_frontend()
+    response_data = get_current_game_data_for_frontend(state)
     response_data["message"] = "Game reset and settings applied."
     return jsonify(response_data)
 
+# --- Multi-board games ---
+# Dordle/Quordle/Octordle-style games: every guess is played on all boards at
+# once. The state keeps one candidate bitmask per board over the dictionary's
+# index (see "Multi-board games" in solver_logic.py) and lives under its own
+# session key, so it doesn't replace the player's single-board game.
+# Suggestions always use joint entropy scoring, whatever SUGGESTION_STRATEGY is.
+MULTI_BOARD_GUESSES = {2: 7, 4: 9, 8: 13}  # Boards -> guesses allowed
+DEFAULT_MULTI_BOARDS = 4
+MULTI_BOARD_SAMPLE_SIZE = 20
+
+def initialize_multi_game_state(boards, exclude_past_setting, dictionary_name=DEFAULT_DICTIONARY):
+    """Creates a new multi-board game in the store and points the session at it."""
+    dictionary = get_dictionary(dictionary_name)
+    word_lists = get_word_lists()
+    index = word_lists.index(dictionary_name)
+    game_word_list = word_lists.words(dictionary_name, exclude_past=exclude_past_setting)
+    start_mask = index.mask_for(game_word_list)
+
+    state = {
+        'dictionary': dictionary_name,
+        'word_length': dictionary['word_length'],
+        'exclude_past_words': exclude_past_setting,
+        'total_raw_word_count': len(index),
+        'past_words_loaded_count': len(word_lists.past_words(dictionary_name)) if exclude_past_setting else 0,
+        'game_word_count': len(game_word_list),
+        'word_list_version': word_lists.version,
+        'index_digest': index.digest,
+        'history': [], # [guess, [feedback or None per board]] pairs played so far
+        'boards': [start_mask] * boards,
+        'solved_boards': [None] * boards, # Answer of each board once solved
+        'max_guesses': MULTI_BOARD_GUESSES[boards],
+        'guess_number': 1,
+        'game_over': False,
+        'solved': False
+    }
+    game_id = new_game_id()
+    if 'multi_game_id' in session:
+        get_game_store().delete(session['multi_game_id'])
+    session['multi_game_id'] = game_id
+    get_game_store().put(game_id, state)
+    return state
+
+def get_multi_game_state():
+    """Returns the current multi-board game, starting a new one if there is none (or it expired)."""
+    state = get_game_store().get(session['multi_game_id']) if 'multi_game_id' in session else None
+    if state is None:
+        state = initialize_multi_game_state(DEFAULT_MULTI_BOARDS, True)
+    elif get_base_index(state) is None:
+        state = initialize_multi_game_state(len(state['boards']), state['exclude_past_words'], state['dictionary'])
+        g.game_restarted = True
+    return state
+
+def get_multi_game_data_for_frontend(state):
+    """Prepares a multi-board game's state (one entry per board) and suggestion for the frontend."""
+    index = get_base_index(state)
+    unsolved = [mask for mask, answer in zip(state['boards'], state['solved_boards']) if answer is None]
+    suggested = solver_suggest_multi_board(index, unsolved) if not state['game_over'] else None
+    boards = []
+    for mask, answer in zip(state['boards'], state['solved_boards']):
+        if answer is not None:
+            boards.append({"solved": True, "answer": answer.upper(), "possible_words_count": 1,
+                           "possible_words_sample": [answer]})
+            continue
+        boards.append({
+            "solved": False,
+            "answer": None,
+            "possible_words_count": index.count(mask),
+            "possible_words_sample": list(islice(solver_iter_candidates(index, mask, "alpha"), MULTI_BOARD_SAMPLE_SIZE))
+        })
+    return {
+        "suggested_guess": suggested.upper() if suggested else "N/A",
+        "boards": boards,
+        "guess_number": state['guess_number'],
+        "max_guesses": state['max_guesses'],
+        "game_over": state['game_over'],
+        "solved": state['solved'],
+        "exclude_past_words_setting": state['exclude_past_words'],
+        "dictionary": state['dictionary'],
+        "word_length": state['word_length'],
+        "word_list_info": get_word_list_info_text(
+            state['game_word_count'],
+            state['total_raw_word_count'],
+            state['past_words_loaded_count'] if state['exclude_past_words'] else 0,
+            state['exclude_past_words']
+        )
+    }
+
+@bp.route('/multi/state')
+def multi_state_route():
+    state = get_multi_game_state()
+    etag = state_etag(state, 'multi_game_id')
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    return with_etag(jsonify(get_multi_game_data_for_frontend(state)), etag)
+
+@bp.route('/multi/submit_guess', methods=['POST'])
+def multi_submit_guess_route():
+    """
+    Plays one guess on every board.
+    Body: {"guess": word, "feedback": [feedback string per board; null for solved boards]}
+    """
+    state = get_multi_game_state()
+    data = request.get_json(silent=True) or {}
+    user_guess = str(data.get('guess', '')).lower()
+    feedbacks = data.get('feedback')
+
+    if g.get('game_restarted'):
+        return jsonify({"error": GAME_RESTARTED_MESSAGE, **get_multi_game_data_for_frontend(state)})
+    if state['game_over']:
+        return jsonify({"error": "Game is over.", **get_multi_game_data_for_frontend(state)})
+
+    word_length = state['word_length']
+    if not user_guess or len(user_guess) != word_length or not user_guess.isascii() or not user_guess.isalpha():
+        return jsonify({"error": "Invalid guess.", **get_multi_game_data_for_frontend(state)})
+    if not isinstance(feedbacks, list) or len(feedbacks) != len(state['boards']):
+        return jsonify({"error": f"Expected one feedback string per board ({len(state['boards'])}).",
+                        **get_multi_game_data_for_frontend(state)})
+    # Solved boards take no feedback, whatever was sent for them
+    feedbacks = [None if answer is not None else feedback for feedback, answer in zip(feedbacks, state['solved_boards'])]
+    for feedback in feedbacks:
+        if feedback is not None and (not isinstance(feedback, str) or len(feedback) != word_length
+                                     or not all(c in "GYX" for c in feedback)):
+            return jsonify({"error": f"Invalid feedback string: {feedback!r}", **get_multi_game_data_for_frontend(state)})
+
+    index = get_base_index(state)
+    boards = apply_feedback_multi(index, state['boards'], user_guess, feedbacks)
+    for board, feedback in enumerate(feedbacks):
+        if feedback == "G" * word_length:
+            state['solved_boards'][board] = user_guess
+    state['boards'] = boards
+    state['history'].append([user_guess, feedbacks])
+    state['guess_number'] += 1
+    state['solved'] = None not in state['solved_boards']
+    state['game_over'] = state['solved'] or state['guess_number'] > state['max_guesses']
+    save_game_state(state, 'multi_game_id')
+
+    response_data = get_multi_game_data_for_frontend(state)
+    if state['solved']:
+        response_data["message"] = "Congratulations! You solved every board."
+    elif any(not mask for mask, answer in zip(boards, state['solved_boards']) if answer is None):
+        response_data["error"] = "No possible words left on a board. Check feedback or word not in list."
+    return jsonify(response_data)
+
+@bp.route('/multi/reset_game', methods=['POST'])
+def multi_reset_game_route():
+    """Starts a multi-board game. Body: {"boards": 2|4|8, "exclude_past_words": bool, "dictionary": name}"""
+    data = request.get_json(silent=True) or {}
+    boards = data.get('boards', DEFAULT_MULTI_BOARDS)
+    if not isinstance(boards, int) or boards not in MULTI_BOARD_GUESSES:
+        return jsonify({"error": f"boards must be one of: {', '.join(map(str, MULTI_BOARD_GUESSES))}"}), 400
+    dictionary_name = data.get('dictionary', DEFAULT_DICTIONARY)
+    if not isinstance(dictionary_name, str) or dictionary_name not in DICTIONARIES:
+        return jsonify({"error": f"Unknown dictionary: {dictionary_name}"}), 400
+
+    state = initialize_multi_game_state(boards, bool(data.get('exclude_past_words', True)), dictionary_name)
+    response_data = get_multi_game_data_for_frontend(state)
+    response_data["message"] = f"New {boards}-board game started."
+    return jsonify(response_data)
+
+# --- Candidate list API ---
+CANDIDATES_PAGE_SIZE = 200
+MAX_CANDIDATES_PAGE_SIZE = 1000
+CANDIDATE_SORTS = ("alpha", "score")
+
+@bp.route('/api/candidates')
+def candidates_route():
+    """
+    One page of the current game's remaining candidates.
+    Query: offset, limit (default 200), sort=alpha|score.
+    Words are streamed off the game's candidate bitmask, so only the requested page is built.
+    """
+    state = get_game_state()
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = max(0, min(int(request.args.get('limit', CANDIDATES_PAGE_SIZE)), MAX_CANDIDATES_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "offset and limit must be integers."}), 400
+    sort = request.args.get('sort', 'alpha')
+    if sort not in CANDIDATE_SORTS:
+        return jsonify({"error": f"sort must be one of: {', '.join(CANDIDATE_SORTS)}"}), 400
+
+    etag = state_etag(state, 'game_id', offset, limit, sort)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    index = get_base_index(state)
+    words = solver_iter_candidates(index, state['candidates'], sort)
+    return with_etag(jsonify({
+        "offset": offset,
+        "limit": limit,
+        "sort": sort,
+        "total": index.count(state['candidates']),
+        "words": list(islice(words, offset, offset + limit))
+    }), etag)
+
+# --- Metrics ---
+@bp.route('/metrics')
+def metrics_route():
+    """Prometheus text exposition of this worker process's metrics."""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+# --- Stateless batch API ---
+MAX_BATCH_GAMES = 1000
+BATCH_SAMPLE_SIZE = 20
+
+@bp.route('/api/solve_batch', methods=['POST'])
+def solve_batch_route():
+    """
+    Solves many boards in one request without touching the session.
+    Suggestions use the configured strategy until BATCH_TIME_BUDGET runs out,
+    then the frequency heuristic (reported per game as "suggestion_strategy").
+    Body: {"games": [[[guess, feedback], ...], ...], "exclude_past_words": bool,
+           "dictionary": name, "hard_mode": bool, "sample_size": int}
+    """
+    data = request.get_json(silent=True) or {}
+    games = data.get('games')
+    if not isinstance(games, list):
+        return jsonify({"error": "'games' must be a list."}), 400
+    if len(games) > MAX_BATCH_GAMES:
+        return jsonify({"error": f"At most {MAX_BATCH_GAMES} games per request."}), 400
+    try:
+        sample_size = max(0, min(int(data.get('sample_size', BATCH_SAMPLE_SIZE)), 200))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'sample_size' must be an integer."}), 400
+
+    dictionary_name = data.get('dictionary', DEFAULT_DICTIONARY)
+    if not isinstance(dictionary_name, str) or dictionary_name not in DICTIONARIES:
+        return jsonify({"error": f"Unknown dictionary: {dictionary_name}"}), 400
+    word_length = get_dictionary(dictionary_name)['word_length']
+    hard_mode = bool(data.get('hard_mode', False))
+    word_lists = get_word_lists()
+    index = word_lists.index(dictionary_name)
+    start_words = word_lists.words(dictionary_name, exclude_past=bool(data.get('exclude_past_words', False)))
+    initial_mask = index.mask_for(start_words)
+
+    errors = [validate_history(game, word_length) for game in games]
+    histories = [[(guess.lower(), feedback.upper()) for guess, feedback in game]
+                 for game, error in zip(games, errors) if error is None]
+    masks = iter(solver_filter_batch(index, histories, initial_mask))
+
+    # One deadline for the whole request, so a large batch can't hold the worker for long
+    deadline = time.perf_counter() + current_app.config['BATCH_TIME_BUDGET']
+    results = []
+    for error in errors:
+        if error is not None:
+            results.append({"error": error})
+            continue
+        remaining = index.words_for(next(masks))
+        time_left = deadline - time.perf_counter()
+        strategy = current_app.config['SUGGESTION_STRATEGY'] if time_left > 0 else 'frequency'
+        suggested = solver_suggest_next_guess(
+            remaining, strategy=strategy, hard_mode=hard_mode, index=index,
+            time_budget=max(0.0, min(ENTROPY_TIME_BUDGET, time_left))
+        ) if remaining else None
+        if strategy != current_app.config['SUGGESTION_STRATEGY']:
+            metrics.inc('batch_budget_fallbacks')
+        results.append({
+            "possible_words_count": len(remaining),
+            "possible_words_sample": remaining[:sample_size],
+            "suggested_guess": suggested.upper() if suggested else "N/A",
+            "suggestion_strategy": strategy
+        })
+    return jsonify({"results": results})
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
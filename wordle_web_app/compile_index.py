@@ -0,0 +1,41 @@
+import argparse
+import os
+import time
+
+from solver_logic import (
+    compile_word_index,
+    get_compiled_index,
+    load_dictionaries,
+    DICTIONARIES
+)
+
+# Build step for the binary word index files (see "Compiled word index files"
+# in solver_logic.py). Compiles every registered dictionary's words file and
+# past answers file into <stem>.index.bin; the app and the CLI tools pick the
+# files up automatically and fall back to the text files whenever those change.
+# Rerun after editing words.txt or past_used_words.txt.
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile word lists into memory-mappable binary index files.")
+    parser.add_argument("--words", help="compile only this words file (default: every dictionary)")
+    parser.add_argument("--past", default="past_used_words.txt", help="past answers file for --words")
+    parser.add_argument("--word-length", type=int, default=5, help="word length for --words")
+    parser.add_argument("--no-bitsets", action="store_true", help="omit the letter/position bitsets")
+    parser.add_argument("--patterns", action="store_true", help="embed the pattern matrix (needs numpy)")
+    args = parser.parse_args()
+
+    if args.words:
+        targets = [(args.words, args.past, args.word_length)]
+    else:
+        load_dictionaries()
+        targets = [(options["words"], options["past"], options["word_length"]) for options in DICTIONARIES.values()]
+
+    for words, past, word_length in targets:
+        start = time.perf_counter()
+        path = compile_word_index(words, past, word_length, bitsets=not args.no_bitsets, patterns=args.patterns)
+        if get_compiled_index(words, word_length, past) is None:
+            raise SystemExit(f"{path} failed validation")
+        print(f"Wrote {path} ({os.path.getsize(path)} bytes) in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
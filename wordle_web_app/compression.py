@@ -0,0 +1,88 @@
+import gzip
+import threading
+from collections import OrderedDict
+
+from metrics import inc
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it responses are gzip-compressed
+    brotli = None
+
+# Response compression for HTML, JSON and the static CSS/JS, with the best
+# encoding the client accepts: brotli when the module is installed, else gzip.
+# Dynamic responses are compressed at a fast level on every request; static
+# files are compressed once at the highest level and kept, keyed by their ETag
+# (which changes with the file). As nginx does, a compressed response's ETag
+# becomes weak: it is the same resource in another encoding, so conditional
+# requests still match it.
+
+COMPRESSIBLE_TYPES = frozenset((
+    "application/json", "application/javascript", "text/javascript", "text/css", "text/html", "text/plain"
+))
+COMPRESS_MIN_BYTES = 512  # Smaller bodies aren't worth the CPU or the header
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5        # Dynamic responses; cached (static) bodies use the maximum
+STATIC_CACHE_MAX = 64     # Compressed static bodies kept
+
+_STATIC_CACHE = OrderedDict()  # (ETag, encoding) -> compressed bytes
+_STATIC_CACHE_LOCK = threading.Lock()
+
+def choose_encoding(accept_encodings):
+    """"br", "gzip" or None for a request's Accept-Encoding (a werkzeug Accept object)."""
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+def compress(data, encoding, best=False):
+    """data compressed with encoding ("br" or "gzip"); best trades CPU for the smallest output."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+
+def _cached_compress(data, encoding, cache_key):
+    key = (cache_key, encoding)
+    with _STATIC_CACHE_LOCK:
+        compressed = _STATIC_CACHE.get(key)
+        if compressed is not None:
+            _STATIC_CACHE.move_to_end(key)
+            return compressed
+    compressed = compress(data, encoding, best=True)
+    with _STATIC_CACHE_LOCK:
+        _STATIC_CACHE[key] = compressed
+        while len(_STATIC_CACHE) > STATIC_CACHE_MAX:
+            _STATIC_CACHE.popitem(last=False)
+    return compressed
+
+def compress_response(response, accept_encodings, cache=False):
+    """
+    Compresses a 200 response in place when its type is compressible and the
+    client accepts an encoding. cache=True keeps the compressed body by the
+    response's ETag (for static files). Returns the response.
+    """
+    if (response.status_code != 200 or response.mimetype not in COMPRESSIBLE_TYPES
+            or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    response.direct_passthrough = False  # Static files are streamed; read them so they can be compressed
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    etag, _ = response.get_etag()
+    if cache and etag:
+        compressed = _cached_compress(data, encoding, etag)
+    else:
+        compressed = compress(data, encoding)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(etag, weak=True)
+    inc("compressed_responses", encoding=encoding)
+    inc("compression_saved_bytes", len(data) - len(compressed))
+    return response
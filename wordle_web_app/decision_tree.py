@@ -0,0 +1,220 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from solver_logic import (
+    get_word_index,
+    get_word_list,
+    pattern_entropies,
+    decode_pattern,
+    candidates_fingerprint,
+    word_list_digest,
+    DECISION_TREE_FILENAME,
+    DECISION_TREE_VERSION,
+    np
+)
+from tournament import read_results
+
+# Offline builder for the decision tree served by the "optimal" strategy (see
+# "Decision trees" in solver_logic.py). Starting from a fixed opener, every
+# candidate set is solved for the minimum total number of guesses over its
+# answers (equivalently, minimum expected guesses), by depth-first search with
+# a lower bound that skips guesses which can't beat the best found so far.
+# Solved sets are memoized by their candidate indices, so a set reached
+# through different feedback is only solved once per worker.
+#
+# The search is exact over the guesses it considers. breadth=0 considers every
+# allowed guess at every node, which is the true optimum but far slower; by
+# default each node only tries the `breadth` highest-entropy guesses (plus its
+# best possible answer), which in practice rarely changes the result.
+#
+# The opener's feedback buckets are independent subproblems: they fan out over
+# a process pool, and each solved bucket is appended to a JSONL checkpoint as
+# it finishes, so an interrupted build resumes with the buckets still missing.
+
+DEFAULT_OPENER = "crane"
+DEFAULT_BREADTH = 10
+
+def _lower_bound(sizes):
+    """Fewest total guesses for buckets of these sizes: one each, and all but one a second."""
+    return int((2 * sizes - 1).sum())
+
+def solve(index, candidates, hard_mode=False, breadth=DEFAULT_BREADTH, memo=None):
+    """
+    (total guesses, first guess) for a sorted array of candidate indices: the
+    sum over its answers of the guesses needed, playing optimally from here.
+    memo maps candidate index bytes to results and is filled as it goes.
+    """
+    n = len(candidates)
+    if n == 1:
+        return 1, int(candidates[0])
+    if n == 2:
+        return 3, int(candidates[0])  # 1 + 2
+    if memo is None:
+        memo = {}
+    key = candidates.tobytes()
+    known = memo.get(key)
+    if known is not None:
+        return known
+
+    matrix = index.pattern_matrix()
+    guesses = candidates if hard_mode else np.arange(len(index))
+    scores = pattern_entropies(matrix, candidates, guesses, word_length=index.word_length)
+    order = np.argsort(-scores, kind='stable')
+    if breadth:
+        order = order[:breadth]
+        if not hard_mode:
+            # A guess that can win outright often beats a slightly more informative one
+            best_candidate = int(np.argmax(np.where(np.isin(guesses, candidates), scores, -1.0)))
+            if best_candidate not in order:
+                order = np.append(order, best_candidate)
+    solved_code = 3 ** index.word_length - 1
+
+    best = (float('inf'), None)
+    for row in order:
+        guess = int(guesses[row])
+        patterns = matrix[guess, candidates]
+        codes, inverse, sizes = np.unique(patterns, return_inverse=True, return_counts=True)
+        if len(codes) == 1:
+            continue  # Tells nothing apart
+        unsolved = codes != solved_code
+        total = n + _lower_bound(sizes[unsolved])
+        if total >= best[0]:
+            continue
+        # Swap each bucket's lower bound for its real cost, largest buckets first
+        for i in np.argsort(-sizes, kind='stable'):
+            if not unsolved[i]:
+                continue
+            cost, _ = solve(index, candidates[inverse == i], hard_mode, breadth, memo)
+            total += cost - (2 * int(sizes[i]) - 1)
+            if total >= best[0]:
+                break
+        if total < best[0]:
+            best = (total, guess)
+
+    memo[key] = best
+    return best
+
+def build_tree(index, candidates, hard_mode=False, breadth=DEFAULT_BREADTH, memo=None, guess=None):
+    """
+    Decision tree node (see solver_logic) for a sorted array of candidate
+    indices, solving it first; guess forces the first guess (the opener).
+    Returns (total guesses, node).
+    """
+    if memo is None:
+        memo = {}
+    if guess is None:
+        _, guess = solve(index, candidates, hard_mode, breadth, memo)
+    patterns = index.pattern_matrix()[guess, candidates]
+    solved_code = 3 ** index.word_length - 1
+    total = len(candidates)
+    children = {}
+    for code in np.unique(patterns):
+        if code != solved_code:
+            cost, children[decode_pattern(int(code), index.word_length)] = build_tree(
+                index, candidates[patterns == code], hard_mode, breadth, memo)
+            total += cost
+    return total, [index.words[guess], candidates_fingerprint(index.words[i] for i in candidates), children]
+
+# Worker process state, set once per process by _init_worker
+_WORKER = {}
+
+def _init_worker(words_filename, hard_mode, breadth):
+    _WORKER["index"] = get_word_index(words_filename)
+    _WORKER["index"].pattern_matrix()
+    _WORKER["hard_mode"] = hard_mode
+    _WORKER["breadth"] = breadth
+    _WORKER["memo"] = {}  # Shared by all buckets this worker solves
+
+def _solve_bucket(job):
+    feedback, indices = job
+    total, node = build_tree(_WORKER["index"], np.array(indices, dtype=np.intp), _WORKER["hard_mode"],
+                             _WORKER["breadth"], _WORKER["memo"])
+    return {"feedback": feedback, "total": total, "tree": node}
+
+def build_decision_tree(answers, opener, output=DECISION_TREE_FILENAME, checkpoint=None, words_filename="words.txt",
+                        hard_mode=False, breadth=DEFAULT_BREADTH, processes=None):
+    """
+    Builds and writes the decision tree for answers starting with opener,
+    resuming from checkpoint (default: output + ".checkpoint.jsonl").
+    Returns the tree dict.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required to build a decision tree")
+    index = get_word_index(words_filename)
+    if opener not in index.positions:
+        raise ValueError(f"Opener {opener!r} is not in {words_filename}")
+    if hard_mode and opener not in answers:
+        raise ValueError("In hard mode the opener must be one of the answers")
+    checkpoint = checkpoint or f"{output}.checkpoint.jsonl"
+    candidates = np.sort(np.fromiter((index.positions[word] for word in answers), dtype=np.intp, count=len(answers)))
+    run = {"digest": word_list_digest(index.words[i] for i in candidates), "opener": opener,
+           "hard_mode": hard_mode, "breadth": breadth}
+
+    opener_row = index.pattern_matrix()[index.positions[opener], candidates]
+    solved_code = 3 ** index.word_length - 1
+    buckets = {decode_pattern(int(code), index.word_length): candidates[opener_row == code]
+               for code in np.unique(opener_row) if code != solved_code}
+
+    # Rows from another build (other list, opener or settings) are ignored
+    done = {row["feedback"]: row for row in read_results(checkpoint)
+            if all(row.get(field) == value for field, value in run.items())}
+    jobs = sorted(((feedback, bucket.tolist()) for feedback, bucket in buckets.items() if feedback not in done),
+                  key=lambda job: -len(job[1]))  # Biggest first so the pool drains evenly
+    if jobs:
+        init_args = (words_filename, hard_mode, breadth)
+        with open(checkpoint, 'a') as file, \
+                multiprocessing.Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+            for result in pool.imap_unordered(_solve_bucket, jobs):
+                result.update(run)
+                file.write(json.dumps(result, separators=(',', ':')) + "\n")
+                file.flush()  # Each solved bucket survives an interruption
+                done[result["feedback"]] = result
+
+    total = len(candidates) + sum(done[feedback]["total"] for feedback in buckets)
+    tree = {
+        "version": DECISION_TREE_VERSION,
+        "opener": opener,
+        "hard_mode": hard_mode,
+        "breadth": breadth,
+        "answers": len(candidates),
+        "total_guesses": total,
+        "tree": [opener, candidates_fingerprint(answers), {feedback: done[feedback]["tree"] for feedback in sorted(buckets)}]
+    }
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(tree, file, separators=(',', ':'))
+    os.replace(tmp_path, output)
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return tree
+
+def tree_depth(node):
+    """Guesses needed in the worst case from a node."""
+    return 1 + max((tree_depth(child) for child in node[2].values()), default=0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the decision tree served by the 'optimal' strategy.")
+    parser.add_argument("--words", default="words.txt", help="word list file")
+    parser.add_argument("--exclude-past", action="store_true", help="solve for the list without past answers")
+    parser.add_argument("--opener", default=DEFAULT_OPENER, help="first guess")
+    parser.add_argument("--hard-mode", action="store_true", help="only guess words consistent with all feedback")
+    parser.add_argument("--breadth", type=int, default=DEFAULT_BREADTH,
+                        help="guesses tried per node (0 = every allowed guess: exact but very slow)")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default=DECISION_TREE_FILENAME, help="tree file to write")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint.jsonl)")
+    args = parser.parse_args()
+
+    answers = get_word_list(filename=args.words, exclude_past=args.exclude_past)
+    start = time.perf_counter()
+    tree = build_decision_tree(answers, args.opener.lower(), args.output, args.checkpoint, args.words,
+                               args.hard_mode, args.breadth, args.processes)
+    print(f"Solved {tree['answers']} answers from {tree['opener'].upper()} in {time.perf_counter() - start:.1f}s: "
+          f"{tree['total_guesses'] / tree['answers']:.4f} guesses on average, at most {tree_depth(tree['tree'])}")
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import observe, timed
+
+# Server-side storage for game state.
+# The Flask session cookie only carries a short game id; the candidate set and
+# letter knowledge live here. States are serialized to compact JSON, with the
+# candidate set (or, for multi-board games, one per board) stored as a hex
+# bitmask over the shared word list (see solver_logic.WordIndex) instead of as
+# word strings.
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+def new_game_id():
+    """Returns a new random, URL-safe game id."""
+    return secrets.token_urlsafe(12)
+
+@timed("state_dumps_seconds")
+def dumps_state(state):
+    """Serializes a game state dict to bytes."""
+    data = dict(state)
+    if 'candidates' in state:
+        data['candidates'] = format(state['candidates'], 'x')
+    if 'boards' in state:
+        data['boards'] = [format(mask, 'x') for mask in state['boards']]
+    blob = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    observe("state_bytes", len(blob))
+    return blob
+
+@timed("state_loads_seconds")
+def loads_state(blob):
+    """Inverse of dumps_state."""
+    data = json.loads(blob)
+    if 'candidates' in data:
+        data['candidates'] = int(data['candidates'], 16)
+    if 'boards' in data:
+        data['boards'] = [int(mask, 16) for mask in data['boards']]
+    return data
+
+
+class MemoryGameStore:
+    """In-process LRU store with TTL eviction. Suitable for a single worker process."""
+
+    def __init__(self, max_games=10000, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_games = max_games
+        self.ttl_seconds = ttl_seconds
+        self._games = OrderedDict()  # game_id -> (expires_at, blob)
+        self._lock = threading.Lock()
+
+    def get(self, game_id):
+        """Returns the stored state for game_id, or None if unknown or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is None:
+                return None
+            expires_at, blob = entry
+            if expires_at < now:
+                del self._games[game_id]
+                return None
+            self._games.move_to_end(game_id)
+        return loads_state(blob)
+
+    def put(self, game_id, state):
+        """Stores state under game_id, evicting the least recently used games if full."""
+        blob = dumps_state(state)
+        with self._lock:
+            self._games[game_id] = (time.time() + self.ttl_seconds, blob)
+            self._games.move_to_end(game_id)
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+
+    def delete(self, game_id):
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def __len__(self):
+        return len(self._games)
+
+
+class SQLiteGameStore:
+    """SQLite file backed store, shareable between worker processes on one host."""
+
+    def __init__(self, path="game_state.sqlite3", ttl_seconds=DEFAULT_TTL_SECONDS, purge_every=500):
+        self.path = os.path.abspath(path)
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = purge_every
+        self._writes = 0
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "game_id TEXT PRIMARY KEY, state BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS games_expires_at ON games (expires_at)")
+        conn.commit()
+
+    def _connect(self):
+        # sqlite3 connections cannot be shared across threads or forked processes,
+        # so keep one per thread and reconnect after a fork (e.g. gunicorn --preload)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, game_id):
+        """Returns the stored state for game_id, or None if unknown or expired."""
+        row = self._connect().execute(
+            "SELECT state FROM games WHERE game_id = ? AND expires_at >= ?", (game_id, time.time())
+        ).fetchone()
+        return loads_state(row[0]) if row else None
+
+    def put(self, game_id, state):
+        """Stores state under game_id, refreshing its expiry."""
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO games (game_id, state, expires_at) VALUES (?, ?, ?)",
+            (game_id, dumps_state(state), time.time() + self.ttl_seconds)
+        )
+        conn.commit()
+        # Expired rows are cleaned up lazily every few hundred writes
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            conn.execute("DELETE FROM games WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+
+    def delete(self, game_id):
+        conn = self._connect()
+        conn.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+        conn.commit()
+
+
+def create_game_store(backend="memory", **options):
+    """Builds a game store by backend name ('memory' or 'sqlite')."""
+    if backend == "memory":
+        return MemoryGameStore(**options)
+    if backend == "sqlite":
+        return SQLiteGameStore(**options)
+    raise ValueError(f"Unknown game store backend: {backend}")
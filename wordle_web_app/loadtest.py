@@ -0,0 +1,267 @@
+import argparse
+import http.cookiejar
+import json
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+
+import metrics
+from solver_logic import get_word_list, feedback_pattern, decode_pattern
+from simulate import percentile, MAX_GUESSES
+
+# Load test and regression benchmark for the web app's routes.
+# Concurrent simulated players each play whole games the way the browser does:
+# reset the game, load the page, then submit the app's suggested guesses with
+# the feedback a random answer from words.txt would give, until solved or out
+# of guesses. Players drive the app in-process through Flask's test client or,
+# with --url, a running server over HTTP (each with its own cookie jar).
+#
+# The report covers requests/sec overall and per route, latency percentiles,
+# response and session cookie sizes, max RSS and, in-process only, the
+# server-side game state size (from the app's metrics) and, with --memory, the
+# memory allocated per request (a sequential tracemalloc pass after the timed run).
+# --save-baseline writes it as JSON; --baseline compares against such a file
+# and exits with status 1 when throughput, a route's p95 latency or a payload
+# size is worse by more than --threshold, so CI can gate releases on it.
+
+DEFAULT_THRESHOLD = 0.2  # Allowed relative regression before --baseline fails
+
+class _TestClientPlayer:
+    """One player's session against the app in this process."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        """(status, parsed JSON or None, response bytes, session cookie bytes)."""
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True), len(response.get_data()), _cookie_bytes(
+            response.headers.getlist('Set-Cookie'))
+
+class _HttpPlayer:
+    """One player's session against a running server."""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'} if data else {})
+        with self.opener.open(request) as response:
+            payload = response.read()
+            cookie_bytes = _cookie_bytes(response.headers.get_all('Set-Cookie') or [])
+            is_json = response.headers.get_content_type() == 'application/json'
+            return response.status, json.loads(payload) if is_json else None, len(payload), cookie_bytes
+
+def _cookie_bytes(set_cookie_headers):
+    """Size of the session cookie's value in Set-Cookie headers (0 if not set)."""
+    for header in set_cookie_headers:
+        name, _, rest = header.partition('=')
+        if name.strip() == 'session':
+            return len(rest.split(';', 1)[0])
+    return 0
+
+def play_games(player, answers, rng, record):
+    """Plays one game per answer, calling record(route, seconds, status, response bytes, cookie bytes) per request."""
+    def timed_request(method, path, body=None):
+        start = time.perf_counter()
+        status, data, size, cookie = player.request(method, path, body)
+        record(f"{method} {path}", time.perf_counter() - start, status, size, cookie)
+        return data or {}
+
+    for answer, exclude_past in answers:
+        data = timed_request('POST', '/reset_game', {'exclude_past_words': exclude_past})
+        timed_request('GET', '/')
+        for _ in range(MAX_GUESSES):
+            guess = data.get('suggested_guess', 'N/A').lower()
+            if guess == 'n/a' or data.get('game_over'):
+                break
+            feedback = decode_pattern(feedback_pattern(guess, answer), len(guess))
+            data = timed_request('POST', '/submit_guess', {'guess': guess, 'feedback': feedback})
+            if data.get('solved'):
+                break
+
+def _summarize(latencies):
+    values = sorted(latencies)
+    return {
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000
+    }
+
+def _sizes(values):
+    values = sorted(values)
+    return {"p50": percentile(values, 0.50), "max": values[-1] if values else 0}
+
+def _game_answers(count, rng):
+    """(answer, exclude_past setting) pairs; answers come from the list the game will start from."""
+    lists = {setting: get_word_list(exclude_past=setting) for setting in (False, True)}
+    pairs = []
+    for _ in range(count):
+        exclude_past = rng.random() < 0.5
+        pairs.append((rng.choice(lists[exclude_past]), exclude_past))
+    return pairs
+
+def _measure_memory(make_player, answers, rng):
+    """Allocated bytes per request (tracemalloc peak over the request), by route, from a sequential replay."""
+    per_route = {}
+    baseline = [0]  # Traced memory when the current request started
+    def record_peak(route, *_):
+        current, peak = tracemalloc.get_traced_memory()
+        per_route.setdefault(route, []).append(peak - baseline[0])
+        tracemalloc.reset_peak()
+        baseline[0] = current
+
+    player = make_player()
+    tracemalloc.start()
+    try:
+        baseline[0] = tracemalloc.get_traced_memory()[0]
+        play_games(player, answers, rng, record_peak)
+    finally:
+        tracemalloc.stop()
+    return {route: {"p50_kb": percentile(sorted(peaks), 0.50) / 1024, "max_kb": max(peaks) / 1024}
+            for route, peaks in sorted(per_route.items())}
+
+def run_load_test(players=8, games_per_player=25, url=None, seed=0, memory=False, warmup_games=5):
+    """Runs the load test and returns the report dict (see the module comment)."""
+    app = None
+    if url:
+        def make_player():
+            return _HttpPlayer(url)
+    else:
+        from app import create_app  # Only needed in-process
+        app = create_app()
+        metrics.REGISTRY.reset()
+        def make_player():
+            return _TestClientPlayer(app)
+
+    rng = random.Random(seed)
+    # Builds indexes and fills first-use caches so they don't count against the timed run
+    play_games(make_player(), _game_answers(warmup_games, rng), rng, lambda *_: None)
+    if app is not None:
+        metrics.REGISTRY.reset()
+
+    samples = []  # (route, seconds, status, response bytes, cookie bytes)
+    lock = threading.Lock()
+    def record(*sample):
+        with lock:
+            samples.append(sample)
+
+    errors = []
+    def run_player(player_seed):
+        player_rng = random.Random(player_seed)
+        try:
+            play_games(make_player(), _game_answers(games_per_player, player_rng), player_rng, record)
+        except Exception as error:  # Report it, but let the other players finish
+            errors.append(repr(error))
+
+    threads = [threading.Thread(target=run_player, args=(rng.random(),)) for _ in range(players)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    routes = {}
+    for route in sorted({sample[0] for sample in samples}):
+        route_samples = [sample for sample in samples if sample[0] == route]
+        routes[route] = {
+            "count": len(route_samples),
+            "requests_per_sec": len(route_samples) / elapsed,
+            "errors": sum(1 for sample in route_samples if sample[2] >= 400),
+            **_summarize([sample[1] for sample in route_samples]),
+            "response_bytes": _sizes([sample[3] for sample in route_samples])
+        }
+    report = {
+        "target": url or "test_client",
+        "players": players,
+        "games": players * games_per_player,
+        "elapsed_seconds": elapsed,
+        "requests": len(samples),
+        "requests_per_sec": len(samples) / elapsed if elapsed else 0.0,
+        "latency": _summarize([sample[1] for sample in samples]),
+        "routes": routes,
+        "session_cookie_bytes": _sizes([sample[4] for sample in samples if sample[4]]),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,  # KiB on Linux
+        "player_errors": errors
+    }
+    if app is not None:
+        state_bytes = metrics.REGISTRY.quantiles("state_bytes")
+        report["state_bytes"] = {"p50": state_bytes.get(0.5, 0), "p99": state_bytes.get(0.99, 0)}
+    if memory and app is not None:
+        report["memory_per_request"] = _measure_memory(make_player, _game_answers(warmup_games, rng), rng)
+    return report
+
+def compare_to_baseline(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Human-readable regressions of report against a baseline report (empty if none)."""
+    regressions = []
+    def check(label, current, previous, higher_is_worse=True):
+        if not previous:
+            return
+        change = (current - previous) / previous
+        if (change if higher_is_worse else -change) > threshold:
+            regressions.append(f"{label}: {previous:.3f} -> {current:.3f} ({change:+.0%})")
+
+    check("requests/sec", report["requests_per_sec"], baseline.get("requests_per_sec"), higher_is_worse=False)
+    for route, stats in report["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if previous:
+            check(f"{route} p95 ms", stats["p95_ms"], previous.get("p95_ms"))
+            check(f"{route} response bytes p50", stats["response_bytes"]["p50"], previous.get("response_bytes", {}).get("p50"))
+    check("session cookie bytes max", report["session_cookie_bytes"]["max"], baseline.get("session_cookie_bytes", {}).get("max"))
+    if "state_bytes" in report:
+        check("state bytes p99", report["state_bytes"]["p99"], baseline.get("state_bytes", {}).get("p99"))
+    return regressions
+
+def print_report(report):
+    print(f"Target: {report['target']}, players: {report['players']}, games: {report['games']}")
+    print(f"Requests: {report['requests']} in {report['elapsed_seconds']:.1f}s ({report['requests_per_sec']:.1f} req/s)")
+    for route, stats in report["routes"].items():
+        print(f"{route}: {stats['count']} requests ({stats['requests_per_sec']:.1f}/s, {stats['errors']} errors), "
+              f"p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+              f"response {stats['response_bytes']['p50']} B")
+    print(f"Session cookie: p50 {report['session_cookie_bytes']['p50']} B, max {report['session_cookie_bytes']['max']} B")
+    if "state_bytes" in report:
+        print(f"Server-side game state: p50 {report['state_bytes']['p50']} B, p99 {report['state_bytes']['p99']} B")
+    print(f"Max RSS: {report['max_rss_kb'] / 1024:.1f} MiB")
+    for route, stats in report.get("memory_per_request", {}).items():
+        print(f"{route} allocations: p50 {stats['p50_kb']:.1f} KiB, max {stats['max_kb']:.1f} KiB")
+    for error in report["player_errors"]:
+        print(f"Player error: {error}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Wordle web app with concurrent simulated players.")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process test client)")
+    parser.add_argument("--players", type=int, default=8, help="concurrent players")
+    parser.add_argument("--games", type=int, default=25, help="games per player")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for answers and settings")
+    parser.add_argument("--memory", action="store_true", help="also measure allocations per request (tracemalloc)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the report as a baseline JSON file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    report = run_load_test(args.players, args.games, args.url, args.seed, args.memory)
+    print_report(report)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = compare_to_baseline(report, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions or report["player_errors"]:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import functools
+import threading
+import time
+from collections import deque
+
+# Lightweight in-process metrics, rendered in the Prometheus text format by the
+# /metrics route. Summaries keep a sliding window of recent observations for
+# p50/p95/p99 plus running totals; counters are plain running totals; gauges
+# are callbacks read at scrape time. Everything is per process, so under a
+# multi-worker server each scrape sees the worker that answered it.
+#
+# Recording is off until enable() is called (create_app does so unless
+# METRICS is False). While disabled, timed() wrappers and observe()/inc() cost
+# one attribute check, so the CLI tools and benchmarks run unaffected.
+
+QUANTILES = (0.5, 0.95, 0.99)
+WINDOW_SIZE = 2048  # Recent observations kept per summary for quantiles
+
+class MetricsRegistry:
+    """Process-wide collection of summaries, counters and gauges."""
+
+    def __init__(self, prefix="wordle_"):
+        self.prefix = prefix
+        self.enabled = False
+        self._summaries = {}  # (name, labels) -> [window deque, count, sum]
+        self._counters = {}   # (name, labels) -> value
+        self._gauges = {}     # name -> callback returning a number or {labels: number}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def observe(self, name, value, **labels):
+        """Adds one observation (a duration in seconds, a size, a count) to a summary."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = [deque(maxlen=WINDOW_SIZE), 0, 0.0]
+            summary[0].append(value)
+            summary[1] += 1
+            summary[2] += value
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def gauge(self, name, callback, help_text=""):
+        """Registers callback() -> number, or {labels tuple: number}, read at each scrape."""
+        self._gauges[name] = callback
+        if help_text:
+            self.describe(name, help_text)
+
+    def reset(self):
+        with self._lock:
+            self._summaries.clear()
+            self._counters.clear()
+
+    def quantiles(self, name, **labels):
+        """{quantile: value} over the recent window of a summary (empty if unobserved)."""
+        with self._lock:
+            summary = self._summaries.get((name, tuple(sorted(labels.items()))))
+            window = sorted(summary[0]) if summary else []
+        return _quantiles(window)
+
+    def render(self):
+        """The registry in Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            summaries = {key: (sorted(window), count, total) for key, (window, count, total) in self._summaries.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        for name in sorted({name for name, _ in summaries}):
+            full_name = self.prefix + name
+            self._header(lines, name, full_name, "summary")
+            for (metric, labels), (window, count, total) in sorted(summaries.items()):
+                if metric != name:
+                    continue
+                for q, value in _quantiles(window).items():
+                    lines.append(f"{full_name}{_labels(labels + (('quantile', q),))} {_number(value)}")
+                lines.append(f"{full_name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{full_name}_count{_labels(labels)} {count}")
+        for name in sorted({name for name, _ in counters}):
+            full_name = self.prefix + name + "_total"
+            self._header(lines, name, full_name, "counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+        for name, callback in sorted(self._gauges.items()):
+            full_name = self.prefix + name
+            values = callback()
+            if not isinstance(values, dict):
+                values = {(): values}
+            self._header(lines, name, full_name, "gauge")
+            for labels, value in sorted(values.items()):
+                lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines, name, full_name, metric_type):
+        if name in self._help:
+            lines.append(f"# HELP {full_name} {self._help[name]}")
+        lines.append(f"# TYPE {full_name} {metric_type}")
+
+def _quantiles(sorted_window):
+    if not sorted_window:
+        return {}
+    last = len(sorted_window) - 1
+    return {q: sorted_window[min(last, int(q * len(sorted_window)))] for q in QUANTILES}
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+REGISTRY = MetricsRegistry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def enable(enabled=True):
+    REGISTRY.enabled = enabled
+
+def observe(name, value, **labels):
+    REGISTRY.observe(name, value, **labels)
+
+def inc(name, amount=1, **labels):
+    REGISTRY.inc(name, amount, **labels)
+
+def timed(name, **labels):
+    """Decorator recording each call's wall time, in seconds, in the summary `name`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                REGISTRY.observe(name, time.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
+
+def render():
+    return REGISTRY.render()
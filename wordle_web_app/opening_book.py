@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+import time
+
+from solver_logic import (
+    get_word_index,
+    get_word_list,
+    suggest_next_guess,
+    feedback_pattern,
+    decode_pattern,
+    word_list_digest
+)
+
+# Opening book: precomputed suggestions for the first guesses of a game.
+# For each starter and each feedback pattern it can produce, the book stores the
+# best next guess (and optionally deeper levels), so early-game requests are a
+# dictionary lookup instead of live scoring. Books are keyed by a digest of the
+# game's starting candidate list, so a changed words.txt / past_used_words.txt
+# simply makes the stale book miss rather than give wrong answers.
+#
+# File layout (JSON):
+#   {"version": 1, "books": {<word list digest>: {<starter>: <node>}}}
+#   node = {"pattern string": [next_guess, {deeper patterns...}]}
+
+BOOK_VERSION = 1
+DEFAULT_BOOK_FILENAME = "opening_book.json"
+STARTERS = ("crane", "slate", "soare", "adieu", "trace")
+
+def _bucket_by_pattern(guess, candidates):
+    """Groups candidates by the feedback guess would get against each."""
+    buckets = {}
+    for answer in candidates:
+        buckets.setdefault(feedback_pattern(guess, answer), []).append(answer)
+    return buckets
+
+def _build_node(guess, candidates, depth, strategy):
+    """Book node for guess played against candidates, expanded depth more levels."""
+    node = {}
+    for pattern, bucket in sorted(_bucket_by_pattern(guess, candidates).items()):
+        feedback = decode_pattern(pattern, len(guess))
+        if feedback == "G" * len(guess):
+            continue
+        next_guess = suggest_next_guess(bucket, strategy=strategy, time_budget=float('inf'))
+        children = _build_node(next_guess, bucket, depth - 1, strategy) if depth > 1 and len(bucket) > 2 else {}
+        node[feedback] = [next_guess, children] if children else [next_guess]
+    return node
+
+def build_opening_book(candidates, starters=STARTERS, depth=1, strategy="entropy"):
+    """Builds the book for one starting candidate list: {starter: node}."""
+    return {starter: _build_node(starter, candidates, depth, strategy) for starter in starters}
+
+def load_opening_book(filename=DEFAULT_BOOK_FILENAME):
+    """Loads the book file once; returns {} if it is missing or from another version."""
+    try:
+        with open(filename, 'r') as file:
+            data = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("version") != BOOK_VERSION:
+        return {}
+    return data.get("books", {})
+
+def lookup_opening(books, candidates_digest, history):
+    """
+    Next guess from the book for a game that started from the candidate list
+    with digest candidates_digest and has played history [(guess, feedback), ...].
+    Returns None when the book does not cover this position.
+    """
+    if not history:
+        return None
+    node = books.get(candidates_digest, {}).get(history[0][0])
+    for i, (_, feedback) in enumerate(history):
+        if node is None:
+            return None
+        entry = node.get(feedback)
+        if entry is None:
+            return None
+        if i == len(history) - 1:
+            return entry[0]
+        # The player must have followed the book's suggestion to go deeper
+        children = entry[1] if len(entry) > 1 else None
+        node = children if history[i + 1][0] == entry[0] else None
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book for the Wordle solver web app.")
+    parser.add_argument("--words", default="words.txt", help="word list file")
+    parser.add_argument("--output", default=DEFAULT_BOOK_FILENAME, help="book file to write")
+    parser.add_argument("--depth", type=int, default=1, help="levels after the starter (1 = second guess only)")
+    parser.add_argument("--strategy", default="entropy", help="suggest_next_guess strategy used to fill the book")
+    args = parser.parse_args()
+
+    get_word_index(args.words).pattern_matrix()  # Warm the index and pattern matrix once
+    books = {}
+    # One book per starting list the app can use: all words, and past answers excluded
+    for exclude_past in (False, True):
+        candidates = get_word_list(filename=args.words, exclude_past=exclude_past)
+        digest = word_list_digest(candidates)
+        if digest in books:
+            continue
+        start = time.perf_counter()
+        books[digest] = build_opening_book(candidates, depth=args.depth, strategy=args.strategy)
+        print(f"Built book for {len(candidates)} words (exclude_past={exclude_past}) in {time.perf_counter() - start:.1f}s")
+
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump({"version": BOOK_VERSION, "books": books}, file, separators=(',', ':'))
+    os.replace(tmp_path, args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from itertools import islice
+
+from solver_logic import (
+    get_dictionary,
+    get_dictionary_index,
+    get_dictionary_words,
+    load_dictionaries,
+    filter_batch,
+    validate_history,
+    DEFAULT_DICTIONARY,
+    DICTIONARIES,
+    np
+)
+
+# Reverse queries: "which answers are consistent with this board?" for boards
+# pulled from logs, in bulk. A board is a list of [guess, feedback] pairs with
+# the same semantics as filter_words; boards are narrowed together in batches
+# with filter_batch, and batches fan out over a process pool whose workers all
+# read the same memory-mapped pattern matrix (or compiled index file).
+#
+# Input (JSONL, one board per line): either a bare [[guess, feedback], ...]
+# list or {"id": ..., "board": [[guess, feedback], ...]}.
+# Output (JSONL, same order): {"id": ..., "count": n, "words": [...]}, or
+# {"id": ..., "error": "..."} for a malformed line.
+
+DEFAULT_BATCH_SIZE = 2048  # Boards per filter_batch call (and per pool task)
+
+def query_boards(boards, dictionary=DEFAULT_DICTIONARY, exclude_past=False, max_words=None):
+    """
+    Matching answers for each board in a list, as result dicts
+    ({"count": n, "words": [...]} or {"error": "..."}), in input order.
+    max_words caps each word list (0 = counts only, None = no cap).
+    """
+    word_length = get_dictionary(dictionary)["word_length"]
+    index = get_dictionary_index(dictionary)
+    initial_mask = index.mask_for(get_dictionary_words(dictionary, exclude_past))
+
+    errors = [validate_history(board, word_length) for board in boards]
+    histories = [[(guess.lower(), feedback.upper()) for guess, feedback in board]
+                 for board, error in zip(boards, errors) if error is None]
+    masks = iter(filter_batch(index, histories, initial_mask))
+
+    results = []
+    for error in errors:
+        if error is not None:
+            results.append({"error": error})
+            continue
+        mask = next(masks)
+        result = {"count": index.count(mask)}
+        if max_words != 0:
+            result["words"] = list(islice(index.iter_words(mask, "alpha"), max_words))
+        results.append(result)
+    return results
+
+def _parse_line(line):
+    """(id, board) for an input line; board is None if the line isn't JSON."""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None, None
+    if isinstance(data, dict):
+        return data.get("id"), data.get("board")
+    return None, data
+
+# Worker process state, set once per process by _init_worker
+_WORKER = {}
+
+def _init_worker(dictionaries, dictionary, exclude_past, max_words):
+    # Spawned workers don't see dictionaries registered at runtime in the parent
+    DICTIONARIES.update(dictionaries)
+    _WORKER.update(dictionary=dictionary, exclude_past=exclude_past, max_words=max_words)
+    index = get_dictionary_index(dictionary)
+    if np is not None:
+        index.pattern_matrix()
+
+def _query_lines(lines):
+    """Worker side: JSONL lines in, JSONL lines out (parsing and formatting stay off the parent)."""
+    parsed = [_parse_line(line) for line in lines]
+    results = query_boards([board for _, board in parsed], _WORKER["dictionary"], _WORKER["exclude_past"],
+                           _WORKER["max_words"])
+    output = []
+    for (board_id, board), result in zip(parsed, results):
+        if board is None:
+            result = {"error": "Line is not valid JSON."}
+        if board_id is not None:
+            result = {"id": board_id, **result}
+        output.append(json.dumps(result, separators=(',', ':')))
+    return output
+
+def _batches(lines, batch_size):
+    batch = []
+    for line in lines:
+        if line.strip():
+            batch.append(line)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def stream_queries(lines, dictionary=DEFAULT_DICTIONARY, exclude_past=False, max_words=None,
+                   batch_size=DEFAULT_BATCH_SIZE, processes=None):
+    """
+    Yields one JSON result line per non-blank input line, in input order.
+    Batches are answered by a process pool (processes=1 answers inline).
+    """
+    load_dictionaries()
+    init_args = (dict(DICTIONARIES), dictionary, exclude_past, max_words)
+    # Built before the pool forks, so workers share the index copy-on-write
+    _init_worker(*init_args)
+    batches = _batches(lines, batch_size)
+    if processes == 1:
+        for batch in batches:
+            yield from _query_lines(batch)
+        return
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+        for output in pool.imap(_query_lines, batches):
+            yield from output
+
+def main():
+    parser = argparse.ArgumentParser(description="List the answers consistent with each board in a JSONL file.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL boards file (default: stdin)")
+    parser.add_argument("--output", default="-", help="JSONL results file (default: stdout)")
+    parser.add_argument("--dictionary", default=DEFAULT_DICTIONARY, help="dictionary the boards were played with")
+    parser.add_argument("--exclude-past", action="store_true", help="start from the list without past answers")
+    parser.add_argument("--max-words", type=int, default=None, help="cap each word list (0 = counts only)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="boards per batch")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+    load_dictionaries()
+    if args.dictionary not in DICTIONARIES:
+        parser.error(f"unknown dictionary: {args.dictionary}")
+
+    source = sys.stdin if args.input == "-" else open(args.input, 'r')
+    sink = sys.stdout if args.output == "-" else open(args.output, 'w')
+    start = time.perf_counter()
+    count = 0
+    try:
+        for line in stream_queries(source, args.dictionary, args.exclude_past, args.max_words,
+                                   args.batch_size, args.processes):
+            sink.write(line + "\n")
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"Answered {count} boards in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from solver_logic import (
+    get_word_list,
+    get_word_index,
+    filter_words,
+    suggest_next_guess,
+    feedback_pattern,
+    decode_pattern,
+    SUGGESTION_STRATEGIES,
+    PATTERN_MATRIX_STRATEGIES,
+    np
+)
+
+# Offline benchmark: plays suggest_next_guess + filter_words against every
+# answer in words.txt (or a sample) without user input, and reports solve
+# statistics plus per-call latency, so strategy or speed regressions show up
+# before deploying.
+
+MAX_GUESSES = 6
+
+def play_game(answer, word_list, strategy="frequency", starter="crane", use_cache=True, max_guesses=MAX_GUESSES,
+              index=None):
+    """
+    Plays one game against answer the way the app does.
+    index is the WordIndex to filter and score against (default: one covering word_list).
+    Returns (guesses used or None if unsolved, filter timings, suggest timings).
+    """
+    possible_words = list(word_list)
+    known_letters = [None] * 5
+    present_letters = set()
+    absent_letters = set()
+    yellow_misplaced = [set() for _ in range(5)]
+    filter_times = []
+    suggest_times = []
+
+    for guess_number in range(1, max_guesses + 1):
+        if guess_number == 1 and starter:
+            guess = starter
+        else:
+            start = time.perf_counter()
+            guess = suggest_next_guess(possible_words, strategy=strategy, use_cache=use_cache, index=index)
+            suggest_times.append(time.perf_counter() - start)
+        if guess is None:
+            return None, filter_times, suggest_times
+
+        feedback = decode_pattern(feedback_pattern(guess, answer), len(guess))
+        if feedback == "G" * len(guess):
+            return guess_number, filter_times, suggest_times
+
+        start = time.perf_counter()
+        possible_words = filter_words(possible_words, guess, feedback, known_letters, present_letters, absent_letters,
+                                      yellow_misplaced, index=index)
+        filter_times.append(time.perf_counter() - start)
+    return None, filter_times, suggest_times
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+# Worker process state, set once per process by _init_worker
+_WORKER = {}
+
+def _init_worker(words_filename, exclude_past, strategy, starter, use_cache):
+    word_list = get_word_list(filename=words_filename, exclude_past=exclude_past)
+    index = get_word_index(words_filename)
+    if strategy in PATTERN_MATRIX_STRATEGIES and np is not None:
+        index.pattern_matrix()  # Load (memory-mapped) or build before timing anything
+    _WORKER.update(word_list=word_list, index=index, strategy=strategy, starter=starter, use_cache=use_cache)
+
+def _play_worker(answer):
+    guesses, filter_times, suggest_times = play_game(
+        answer, _WORKER['word_list'], _WORKER['strategy'], _WORKER['starter'], _WORKER['use_cache'],
+        index=_WORKER['index']
+    )
+    return answer, guesses, filter_times, suggest_times
+
+def run_benchmark(answers, words_filename="words.txt", exclude_past=False, strategy="frequency",
+                  starter="crane", use_cache=True, processes=None):
+    """Plays every answer across a process pool and returns a summary dict."""
+    init_args = (words_filename, exclude_past, strategy, starter, use_cache)
+    histogram = {str(n): 0 for n in range(1, MAX_GUESSES + 1)}
+    failures = []
+    filter_times = []
+    suggest_times = []
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+        chunksize = max(1, len(answers) // ((processes or multiprocessing.cpu_count()) * 8))
+        for answer, guesses, game_filter_times, game_suggest_times in pool.imap_unordered(_play_worker, answers, chunksize):
+            if guesses is None:
+                failures.append(answer)
+            else:
+                histogram[str(guesses)] += 1
+            filter_times.extend(game_filter_times)
+            suggest_times.extend(game_suggest_times)
+    elapsed = time.perf_counter() - start
+
+    solved = len(answers) - len(failures)
+    filter_times.sort()
+    suggest_times.sort()
+    return {
+        "strategy": strategy,
+        "starter": starter,
+        "games": len(answers),
+        "solved": solved,
+        "failure_rate": len(failures) / len(answers) if answers else 0.0,
+        "average_guesses": sum(int(n) * count for n, count in histogram.items()) / solved if solved else None,
+        "histogram": histogram,
+        "failures": sorted(failures),
+        "latency_ms": {
+            name: {label: percentile(times, q) * 1000 for label, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))}
+            for name, times in (("filter", filter_times), ("suggest", suggest_times))
+        },
+        "elapsed_seconds": elapsed
+    }
+
+def print_report(summary):
+    print(f"Strategy: {summary['strategy']} (starter: {summary['starter'] or 'strategy pick'})")
+    print(f"Games: {summary['games']}, solved: {summary['solved']}, failure rate: {summary['failure_rate']:.2%}")
+    if summary['average_guesses'] is not None:
+        print(f"Average guesses (solved games): {summary['average_guesses']:.3f}")
+    print("Guess histogram:")
+    for n, count in summary['histogram'].items():
+        print(f"  {n}: {count}")
+    print(f"  X: {len(summary['failures'])}")
+    for name, stats in summary['latency_ms'].items():
+        print(f"{name} latency (ms): p50 {stats['p50']:.3f}, p95 {stats['p95']:.3f}, p99 {stats['p99']:.3f}")
+    print(f"Elapsed: {summary['elapsed_seconds']:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Wordle solver against the answer list.")
+    parser.add_argument("--words", default="words.txt", help="word list file (also the answer list)")
+    parser.add_argument("--exclude-past", action="store_true", help="start games without past answers, like the app's setting")
+    parser.add_argument("--strategy", default="frequency", choices=sorted(SUGGESTION_STRATEGIES))
+    parser.add_argument("--starter", default="crane", help="fixed first guess; 'none' lets the strategy choose")
+    parser.add_argument("--sample", type=int, default=0, help="play only this many random answers")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for --sample")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the suggestion cache when timing")
+    parser.add_argument("--json", metavar="PATH", help="also write the summary as JSON")
+    args = parser.parse_args()
+
+    answers = list(get_word_list(filename=args.words, exclude_past=args.exclude_past))  # The list games start from
+    if args.sample:
+        answers = random.Random(args.seed).sample(answers, min(args.sample, len(answers)))
+    starter = None if args.starter.lower() == "none" else args.starter.lower()
+
+    summary = run_benchmark(answers, args.words, args.exclude_past, args.strategy, starter,
+                            not args.no_cache, args.processes)
+    print_report(summary)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(summary, file, indent=2)
+
+if __name__ == "__main__":
+    main()
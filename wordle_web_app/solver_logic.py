@@ -1,11 +1,39 @@
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
 import random
+import struct
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from metrics import observe, timed
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pattern matrix features need it
+    np = None
 
 # In solver_logic.py
 
+# Diagnostics go through logging as "event key=value" messages (no stdout on
+# the request path); only the interactive CLI below prints.
+logger = logging.getLogger(__name__)
+
 # Keep your global WORD_LIST and PAST_WORDS if other functions in solver_logic.py rely on them being global
 WORD_LIST = []
 PAST_WORDS = set() # This will be populated by load_past_words
 
+# Fallback list used when words.txt is missing
+SAMPLE_WORDS = (
+    "crane", "slate", "audio", "adieu", "trace", "roate", "raise", "soare",
+    "alert", "alter", "later", "table", "ratio", "stare", "arise", "irate",
+    "learn", "noble", "media", "ocean", "ideal", "radio", "steam", "dream"
+)
+
 def load_past_words(filename="past_used_words.txt"):
     """Loads past used Wordle words that should be excluded."""
     global PAST_WORDS # Modifies the global PAST_WORDS
@@ -14,13 +42,14 @@ def load_past_words(filename="past_used_words.txt"):
             content = file.read()
             words = [word.strip().lower() for word in content.split('|')]
             PAST_WORDS = set(words) # Set the global
-        print(f"Loaded {len(PAST_WORDS)} past used Wordle words to exclude (global set)")
+        logger.info("past_words_loaded file=%s count=%d", filename, len(PAST_WORDS))
     except FileNotFoundError:
-        print(f"Warning: {filename} not found. No past words will be excluded (global set).")
+        logger.warning("past_words_missing file=%s (no past words will be excluded)", filename)
         PAST_WORDS = set()
     return PAST_WORDS # Return it as well, as app.py uses the returned value for the session
 
 # MODIFIED load_words function:
+@timed("load_words_seconds")
 def load_words(filename="words.txt", past_words_to_exclude=None): # Added past_words_to_exclude
     """
     Loads words from a file.
@@ -42,28 +71,948 @@ def load_words(filename="words.txt", past_words_to_exclude=None): # Added past_w
             # The main list for the app will be the filtered one
             current_word_list = [word for word in all_loaded_words if word not in past_words_to_exclude]
             excluded_count = initial_count - len(current_word_list)
-            print(f"Excluded {excluded_count} words based on argument for this load.")
+            logger.info("past_words_excluded file=%s count=%d", filename, excluded_count)
         else:
             current_word_list = all_loaded_words
-            print("No past words provided for exclusion in this load, using all loaded words.")
+            logger.debug("past_words_not_provided file=%s", filename)
             
         WORD_LIST = list(current_word_list) # Update the global WORD_LIST as well
             
-        print(f"Successfully loaded {len(current_word_list)} words from {filename} for current operation.")
+        logger.info("words_loaded file=%s count=%d", filename, len(current_word_list))
         return current_word_list # Return the list for immediate use by app.py
         
     except FileNotFoundError:
-        print(f"Warning: {filename} not found. Using small sample list instead.")
-        sample_words = [
-            "crane", "slate", "audio", "adieu", "trace", "roate", "raise", "soare", 
-            "alert", "alter", "later", "table", "ratio", "stare", "arise", "irate",
-            "learn", "noble", "media", "ocean", "ideal", "radio", "steam", "dream"
-        ]
+        logger.warning("words_missing file=%s (using the sample list)", filename)
         # Filter sample words too if past_words_to_exclude is provided
-        current_word_list = [word.lower() for word in sample_words if len(word) == 5 and word.isalpha() and word not in past_words_to_exclude]
+        current_word_list = [word.lower() for word in SAMPLE_WORDS if len(word) == 5 and word.isalpha() and word not in past_words_to_exclude]
         WORD_LIST = list(current_word_list)
         return current_word_list
 
+# --- Process-wide word list registry ---
+# load_words/load_past_words re-read and re-parse the text files on every call.
+# The web app only needs each list once per process, so the registry below keeps
+# immutable, pre-filtered tuples keyed by (words file, exclude_past) and only goes
+# back to disk when one of the source files' mtime changes.
+
+_WORD_LIST_REGISTRY = {}  # (abs words path, abs past path or None) -> (mtimes, tuple of words)
+_PAST_WORDS_REGISTRY = {}  # abs past path -> (mtime, frozenset of words)
+_REGISTRY_LOCK = threading.RLock()
+
+def _file_mtime(path):
+    """Returns the file's mtime in nanoseconds, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+@timed("read_word_file_seconds")
+def _parse_words(lines, word_length=5):
+    """Keeps the a-z words of word_length from an iterable of lines, lowercased."""
+    stripped = (line.strip().lower() for line in lines)
+    return tuple(word for word in stripped if len(word) == word_length and word.isascii() and word.isalpha())
+
+def _parse_past_words(text):
+    """Parses past_used_words.txt contents ('|' separated) into a frozenset."""
+    return frozenset(word.strip().lower() for word in text.split('|'))
+
+def _read_word_file(path, word_length=5):
+    """Parses a words.txt style file (one word per line) into a tuple of a-z words of word_length."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return _parse_words(file, word_length)
+
+def _read_past_words_file(path):
+    """Parses a past_used_words.txt style file ('|' separated) into a frozenset."""
+    with open(path, 'r') as file:
+        return _parse_past_words(file.read())
+
+def get_past_words(filename="past_used_words.txt"):
+    """Returns the cached frozenset of past answers, re-reading the file only if it changed."""
+    path = os.path.abspath(filename)
+    mtime = _file_mtime(path)
+    cached = _PAST_WORDS_REGISTRY.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _REGISTRY_LOCK:
+        cached = _PAST_WORDS_REGISTRY.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        if mtime is None:
+            past_words = frozenset()
+        else:
+            past_words = _read_past_words_file(path)
+        _PAST_WORDS_REGISTRY[path] = (mtime, past_words)
+        return past_words
+
+def get_word_list(filename="words.txt", exclude_past=False, past_filename="past_used_words.txt", word_length=5):
+    """
+    Returns a cached, immutable tuple of words from filename.
+    With exclude_past=True, words listed in past_filename are filtered out.
+    The underlying files are only re-read when their mtime changes.
+    """
+    if not past_filename:
+        exclude_past = False
+    words_path = os.path.abspath(filename)
+    past_path = os.path.abspath(past_filename) if exclude_past else None
+    key = (words_path, past_path, word_length)
+    mtimes = (_file_mtime(words_path), _file_mtime(past_path) if past_path else None,
+              _file_mtime(compiled_index_path(words_path)))
+
+    cached = _WORD_LIST_REGISTRY.get(key)
+    if cached is not None and cached[0] == mtimes:
+        return cached[1]
+
+    # Build outside the fast path; the lock keeps concurrent first requests
+    # from all parsing the same file at once.
+    with _REGISTRY_LOCK:
+        cached = _WORD_LIST_REGISTRY.get(key)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+
+        # A compiled index file, when present and up to date, replaces parsing the text
+        compiled = get_compiled_index(words_path, word_length, past_path)
+        if compiled is not None:
+            words = compiled.included_words() if exclude_past else compiled.words
+        elif mtimes[0] is None:
+            logger.warning("words_missing file=%s (using the sample list)", filename)
+            words = SAMPLE_WORDS if word_length == 5 else ()
+        else:
+            words = _read_word_file(words_path, word_length)
+        if exclude_past and compiled is None:
+            past_words = get_past_words(past_filename)
+            if past_words:
+                words = tuple(word for word in words if word not in past_words)
+
+        _WORD_LIST_REGISTRY[key] = (mtimes, words)
+        return words
+
+# --- Bitset word index ---
+# A WordIndex numbers the words of a list and precomputes, as Python int bitsets
+# (bit i set = words[i] matches), which words have a given letter at a given
+# position and which contain a letter at least k times. Applying one guess's
+# feedback is then a handful of AND/ANDNOT operations instead of a Python loop
+# over every candidate. Game state also stores candidate sets as these bitmasks.
+
+_FLAG_SET = ord('1')
+
+def _new_flags(n):
+    """Returns n cleared flags for _flags_to_int (ASCII '0'/'1', index = bit position)."""
+    return bytearray(b'0' * n)
+
+def _flags_to_int(flags):
+    """Packs a bytearray from _new_flags into an int bitmask."""
+    return int(flags[::-1], 2) if flags else 0
+
+class WordIndex:
+    """Letter/position and letter-count bitsets over a fixed word list."""
+
+    def __init__(self, words, source_path=None, bitsets=None):
+        self.words = tuple(words)
+        self.source_path = source_path  # words file the list came from, if any
+        self._pattern_matrix = None
+        self._letter_array = None
+        self.word_length = len(self.words[0]) if self.words else 5
+        self.positions = {word: i for i, word in enumerate(self.words)}
+        self.digest = word_list_digest(self.words)
+        self.is_sorted = all(a <= b for a, b in zip(self.words, self.words[1:]))
+        self._alpha_order = None
+        self.all_mask = (1 << len(self.words)) - 1
+        if bitsets is not None:
+            # Precomputed (letter at position, letter count >= k) bitsets, e.g. from a compiled index file
+            self._letter_at, self._at_least = bitsets
+            return
+
+        n = len(self.words)
+        position_flags = [{} for _ in range(self.word_length)]
+        count_flags = {}  # letter -> [flags for count >= 1, count >= 2, ...]
+        for i, word in enumerate(self.words):
+            counts = {}
+            for pos, letter in enumerate(word):
+                position_flags[pos].setdefault(letter, _new_flags(n))[i] = _FLAG_SET
+                counts[letter] = counts.get(letter, 0) + 1
+            for letter, count in counts.items():
+                per_count = count_flags.setdefault(letter, [])
+                while len(per_count) < count:
+                    per_count.append(_new_flags(n))
+                for k in range(count):
+                    per_count[k][i] = _FLAG_SET
+
+        # _letter_at[pos][letter] and _at_least[letter][k - 1] as int bitsets
+        self._letter_at = [{letter: _flags_to_int(flags) for letter, flags in per_pos.items()}
+                           for per_pos in position_flags]
+        self._at_least = {letter: [_flags_to_int(flags) for flags in per_count]
+                          for letter, per_count in count_flags.items()}
+
+    def __len__(self):
+        return len(self.words)
+
+    def letter_at(self, pos, letter):
+        """Bitset of words with letter at position pos."""
+        return self._letter_at[pos].get(letter, 0)
+
+    def count_at_least(self, letter, k):
+        """Bitset of words containing letter at least k times."""
+        if k <= 0:
+            return self.all_mask
+        per_count = self._at_least.get(letter, ())
+        return per_count[k - 1] if k <= len(per_count) else 0
+
+    def count_exactly(self, letter, k):
+        """Bitset of words containing letter exactly k times."""
+        return self.count_at_least(letter, k) & ~self.count_at_least(letter, k + 1)
+
+    def mask_for(self, words):
+        """Encodes words as a bitmask. Words not in the index are dropped."""
+        positions = self.positions
+        flags = _new_flags(len(self.words))
+        for word in words:
+            i = positions.get(word)
+            if i is not None:
+                flags[i] = _FLAG_SET
+        return _flags_to_int(flags)
+
+    def words_for(self, mask):
+        """Decodes a bitmask back into a list of words, in index order."""
+        words = []
+        while mask:
+            low_bit = mask & -mask
+            words.append(self.words[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return words
+
+    def count(self, mask):
+        """Number of words in a bitmask."""
+        return bin(mask).count("1")
+
+    def iter_words(self, mask, sort="index"):
+        """
+        Lazily yields the words of a bitmask, in index order or (sort="alpha")
+        alphabetical order, without building the full list first.
+        """
+        if sort == "index" or (sort == "alpha" and self.is_sorted):
+            while mask:
+                low_bit = mask & -mask
+                yield self.words[low_bit.bit_length() - 1]
+                mask ^= low_bit
+        elif sort == "alpha":
+            if self._alpha_order is None:
+                self._alpha_order = sorted(range(len(self.words)), key=self.words.__getitem__)
+            for i in self._alpha_order:
+                if (mask >> i) & 1:
+                    yield self.words[i]
+        else:
+            raise ValueError(f"Unknown sort order: {sort}")
+
+    @timed("apply_feedback_seconds")
+    def apply_feedback(self, mask, guess, feedback):
+        """Narrows a candidate bitmask to the words consistent with one guess's feedback."""
+        non_gray_counts = {}
+        has_gray = set()
+        for pos, (letter, fb) in enumerate(zip(guess, feedback)):
+            if fb == 'G':
+                mask &= self.letter_at(pos, letter)
+                non_gray_counts[letter] = non_gray_counts.get(letter, 0) + 1
+            else:
+                # Yellow and gray both mean "not at this position"
+                mask &= ~self.letter_at(pos, letter)
+                if fb == 'Y':
+                    non_gray_counts[letter] = non_gray_counts.get(letter, 0) + 1
+                else:
+                    has_gray.add(letter)
+
+        # Duplicate handling: a gray copy of a letter pins its count to the number
+        # of green/yellow copies; otherwise that number is only a lower bound.
+        for letter in set(guess):
+            count = non_gray_counts.get(letter, 0)
+            if letter in has_gray:
+                mask &= self.count_exactly(letter, count)
+            elif count:
+                mask &= self.count_at_least(letter, count)
+        return mask
+
+    def letter_array(self):
+        """The words as an (N, word_length) uint8 array of letter codes (0 = 'a')."""
+        if self._letter_array is None:
+            self._letter_array = encode_words(self.words)
+        return self._letter_array
+
+    def pattern_matrix(self):
+        """The words x words feedback pattern matrix, loaded or built on first use."""
+        if self._pattern_matrix is None:
+            self._pattern_matrix = load_pattern_matrix(self)
+        return self._pattern_matrix
+
+    def mask_to_bool(self, mask):
+        """Bitmask -> boolean numpy array over the index."""
+        raw = np.frombuffer(mask.to_bytes((len(self.words) + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(raw, count=len(self.words), bitorder='little').astype(bool)
+
+    def mask_to_indices(self, mask):
+        """Bitmask -> sorted numpy array of word indices."""
+        return np.flatnonzero(self.mask_to_bool(mask))
+
+    def bool_to_mask(self, selected):
+        """Boolean numpy array over the index -> bitmask."""
+        return int.from_bytes(np.packbits(selected, bitorder='little').tobytes(), 'little')
+
+# --- Feedback patterns ---
+# A feedback string is encoded as a base-3 number: digit i (weight 3**i) is
+# 0 for gray, 1 for yellow and 2 for green, so a 5-letter pattern fits in a uint8
+# (3**5 = 243); longer words use uint16. The pattern matrix holds feedback_pattern(guess, answer) for every
+# pair of words in an index, which turns "which candidates give this feedback"
+# into matrix[guess_idx, candidates] == pattern.
+FEEDBACK_DIGITS = {'X': 0, 'Y': 1, 'G': 2}
+PATTERN_CHUNK_ROWS = 256  # Guess rows per vectorized block when building the matrix
+
+def encode_feedback(feedback):
+    """'GYXXG' -> base-3 pattern code."""
+    code = 0
+    for fb in reversed(feedback):
+        code = code * 3 + FEEDBACK_DIGITS[fb]
+    return code
+
+def decode_pattern(code, word_length=5):
+    """Base-3 pattern code -> 'GYXXG' style feedback string."""
+    feedback = []
+    for _ in range(word_length):
+        feedback.append("XYG"[code % 3])
+        code //= 3
+    return "".join(feedback)
+
+def is_wordle_pattern(guess, feedback):
+    """
+    True if Wordle itself could show feedback for guess: among repeated
+    letters, yellow copies always come before gray ones. For such feedback,
+    exact pattern equality selects the same words as WordIndex.apply_feedback;
+    for hand-typed feedback like "speed"/"XXXYY" it does not.
+    """
+    gray = set()
+    for letter, fb in zip(guess, feedback):
+        if fb == 'X':
+            gray.add(letter)
+        elif fb == 'Y' and letter in gray:
+            return False
+    return True
+
+def feedback_pattern(guess, answer):
+    """The pattern code Wordle shows for guess when the answer is answer."""
+    digits = [0] * len(guess)
+    unmatched = {}
+    for i, (g, a) in enumerate(zip(guess, answer)):
+        if g == a:
+            digits[i] = 2
+        else:
+            unmatched[a] = unmatched.get(a, 0) + 1
+    # Yellows go left to right while unmatched copies of the letter remain
+    for i, g in enumerate(guess):
+        if digits[i] == 0 and unmatched.get(g, 0) > 0:
+            digits[i] = 1
+            unmatched[g] -= 1
+    code = 0
+    for digit in reversed(digits):
+        code = code * 3 + digit
+    return code
+
+def pattern_dtype(word_length):
+    """Smallest numpy dtype holding every pattern code for word_length."""
+    return np.uint8 if 3 ** word_length <= 256 else np.uint16
+
+def encode_words(words):
+    """Words -> (N, word_length) uint8 array of letter codes (0 = 'a')."""
+    if np is None:
+        raise RuntimeError("numpy is required for array word encodings")
+    word_length = len(words[0]) if words else 5
+    letters = np.frombuffer("".join(words).encode('ascii'), dtype=np.uint8)
+    return (letters.reshape(-1, word_length) - ord('a')).astype(np.uint8)
+
+def build_pattern_matrix(guess_letters, answer_letters):
+    """
+    Vectorized feedback patterns for every (guess, answer) pair.
+    Takes two uint8 letter arrays from encode_words and returns a
+    (len(guesses), len(answers)) matrix of pattern codes (see pattern_dtype).
+    """
+    if np is None:
+        raise RuntimeError("numpy is required to build the pattern matrix")
+    n_guesses, word_length = guess_letters.shape
+    dtype = pattern_dtype(word_length)
+    matrix = np.empty((n_guesses, len(answer_letters)), dtype=dtype)
+    weights = (3 ** np.arange(word_length)).astype(dtype)
+    answers = answer_letters[None, :, :]
+
+    for start in range(0, n_guesses, PATTERN_CHUNK_ROWS):
+        guesses = guess_letters[start:start + PATTERN_CHUNK_ROWS, None, :]
+        green = guesses == answers  # (g, a, L)
+        digits = green.astype(np.uint8) * 2
+        for i in range(word_length):
+            letter = guesses[:, :, i:i + 1]
+            # Copies of this letter in the answer not already used by a green...
+            available = ((answers == letter) & ~green).sum(axis=2)
+            # ...minus those already claimed by earlier non-green copies in the guess
+            claimed = ((guesses[:, :, :i] == letter) & ~green[:, :, :i]).sum(axis=2)
+            yellow = ~green[:, :, i] & (claimed < available)
+            digits[:, :, i] += yellow.astype(np.uint8)
+        matrix[start:start + PATTERN_CHUNK_ROWS] = (digits * weights).sum(axis=2, dtype=dtype)
+    return matrix
+
+def word_list_digest(words):
+    """Short, stable fingerprint of a word list (order matters)."""
+    return hashlib.sha1("\n".join(words).encode('ascii')).hexdigest()[:12]
+
+def _pattern_matrix_path(index):
+    """Cache file for an index's pattern matrix: next to the words file, named by a digest of the list."""
+    digest = word_list_digest(index.words)
+    stem = os.path.splitext(index.source_path)[0]
+    return f"{stem}.patterns.{digest}.npy", f"{stem}.patterns.*.npy"
+
+def load_pattern_matrix(index):
+    """
+    Returns the pattern matrix for index.
+    For file-backed indexes it is persisted as a .npy file next to the words
+    file and memory-mapped, so worker processes share the pages and start
+    instantly; it is rebuilt automatically when the word list changes.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for the pattern matrix")
+    letters = index.letter_array()
+    if index.source_path is None:
+        return build_pattern_matrix(letters, letters)
+
+    path, stale_pattern = _pattern_matrix_path(index)
+    try:
+        matrix = np.load(path, mmap_mode='r')
+        if matrix.shape == (len(index), len(index)):
+            return matrix
+    except (OSError, ValueError):
+        pass
+
+    matrix = build_pattern_matrix(letters, letters)
+    try:
+        # Write to a temp file and rename so concurrent workers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.save(file, matrix)
+        os.replace(tmp_path, path)
+        for old_path in glob.glob(stale_pattern):
+            if old_path != path:
+                os.remove(old_path)
+        return np.load(path, mmap_mode='r')
+    except OSError:
+        return matrix  # Read-only deployment: keep the in-memory copy
+
+# --- Compiled word index files ---
+# compile_index.py turns a words file and its past answers file into
+# <stem>.index.bin, which processes memory-map at startup instead of parsing
+# the text and rebuilding the bitsets (and, optionally, the pattern matrix).
+# The text files stay the source of truth: the header records their SHA-1, and
+# a compiled file whose checksums don't match is ignored in favour of the text.
+#
+# Layout (little-endian, sections 64-byte aligned):
+#   header    INDEX_FILE_HEADER: magic, version, word length, word count, flags,
+#             SHA-1 of the words and past files (zeros if missing), section offsets
+#   letters   N * L uint8 letter codes (0 = 'a'), in words file order
+#   excluded  ceil(N / 8) bytes; bit i set = word i is a past answer
+#   bitsets   (INDEX_FILE_BITSETS) L * 26 "letter at position" bitsets, then
+#             26 * L "letter at least k times" bitsets, ceil(N / 8) bytes each
+#   patterns  (INDEX_FILE_PATTERNS) N * N pattern matrix of pattern_dtype(L)
+INDEX_FILE_MAGIC = b"WRDIDX\0\0"
+INDEX_FILE_VERSION = 1
+INDEX_FILE_HEADER = struct.Struct("<8sIIII20s20sQQQQ")
+INDEX_FILE_BITSETS = 1
+INDEX_FILE_PATTERNS = 2
+_INDEX_FILE_ALIGN = 64
+_LETTERS = bytes(range(ord('a'), ord('z') + 1))
+_TO_LETTER_CODES = bytes.maketrans(_LETTERS, bytes(range(26)))
+_FROM_LETTER_CODES = bytes.maketrans(bytes(range(26)), _LETTERS)
+
+_COMPILED_INDEX_REGISTRY = {}  # (abs words path, abs past path or None) -> (mtimes, CompiledWordIndex or None)
+
+def compiled_index_path(words_filename):
+    """Compiled index file for a words file: <stem>.index.bin next to it."""
+    return os.path.splitext(os.path.abspath(words_filename))[0] + ".index.bin"
+
+def _file_sha1(path):
+    """SHA-1 digest of a file's bytes, or 20 zero bytes if there is no such file."""
+    if path is None:
+        return bytes(20)
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.sha1(file.read()).digest()
+    except OSError:
+        return bytes(20)
+
+def _aligned(offset):
+    return -(-offset // _INDEX_FILE_ALIGN) * _INDEX_FILE_ALIGN
+
+class CompiledWordIndex:
+    """A memory-mapped index file written by compile_word_index."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < INDEX_FILE_HEADER.size:
+            raise ValueError(f"{path}: truncated index file")
+        (magic, version, self.word_length, self.n_words, self.flags, self.words_sha1, self.past_sha1,
+         self._letters_at, self._excluded_at, self._bitsets_at, self._patterns_at) = INDEX_FILE_HEADER.unpack_from(self._buffer)
+        if magic != INDEX_FILE_MAGIC or version != INDEX_FILE_VERSION:
+            raise ValueError(f"{path}: not a version {INDEX_FILE_VERSION} word index file")
+        self._row_bytes = (self.n_words + 7) // 8
+        end = self._excluded_at + self._row_bytes
+        if self.flags & INDEX_FILE_BITSETS:
+            end = self._bitsets_at + 2 * 26 * self.word_length * self._row_bytes
+        if self.flags & INDEX_FILE_PATTERNS:
+            end = self._patterns_at + self.n_words * self.n_words * (1 if 3 ** self.word_length <= 256 else 2)
+        if len(self._buffer) < end:
+            raise ValueError(f"{path}: truncated index file")
+
+        size = self.n_words * self.word_length
+        text = self._buffer[self._letters_at:self._letters_at + size].translate(_FROM_LETTER_CODES).decode('ascii')
+        self.words = tuple(text[i:i + self.word_length] for i in range(0, size, self.word_length))
+
+    def matches(self, words_path, past_path=None):
+        """True if the text files still have the checksums recorded at compile time."""
+        if _file_sha1(words_path) != self.words_sha1:
+            return False
+        return past_path is None or _file_sha1(past_path) == self.past_sha1
+
+    def _row(self, offset, i):
+        start = offset + i * self._row_bytes
+        return int.from_bytes(self._buffer[start:start + self._row_bytes], 'little')
+
+    def excluded_mask(self):
+        """Bitmask over words of the past answers."""
+        return self._row(self._excluded_at, 0)
+
+    def included_words(self):
+        """The words that are not past answers, in file order."""
+        excluded = self.excluded_mask()
+        return tuple(word for i, word in enumerate(self.words) if not (excluded >> i) & 1)
+
+    def bitsets(self):
+        """(letter at position, letter count >= k) bitsets in WordIndex's layout, or None if not compiled in."""
+        if not self.flags & INDEX_FILE_BITSETS:
+            return None
+        rows = iter(range(2 * 26 * self.word_length))
+        letter_at = []
+        for _ in range(self.word_length):
+            per_pos = {letter: self._row(self._bitsets_at, next(rows)) for letter in ALPHABET}
+            letter_at.append({letter: bits for letter, bits in per_pos.items() if bits})
+        at_least = {}
+        for letter in ALPHABET:
+            per_count = [self._row(self._bitsets_at, next(rows)) for _ in range(self.word_length)]
+            while per_count and not per_count[-1]:
+                per_count.pop()
+            if per_count:
+                at_least[letter] = per_count
+        return letter_at, at_least
+
+    def letter_array(self):
+        """Read-only (N, L) uint8 view of the letter codes, backed by the mapping."""
+        return np.frombuffer(self._buffer, dtype=np.uint8, count=self.n_words * self.word_length,
+                             offset=self._letters_at).reshape(self.n_words, self.word_length)
+
+    def pattern_matrix(self):
+        """Read-only view of the compiled pattern matrix, or None if not compiled in."""
+        if not self.flags & INDEX_FILE_PATTERNS:
+            return None
+        return np.frombuffer(self._buffer, dtype=pattern_dtype(self.word_length), count=self.n_words ** 2,
+                             offset=self._patterns_at).reshape(self.n_words, self.n_words)
+
+def get_compiled_index(words_filename, word_length=5, past_filename=None):
+    """
+    The validated compiled index for a words file, or None if there is none,
+    it is for another word length, or its checksums no longer match the words
+    file (and past_filename, when given). Checked again when any file changes.
+    """
+    words_path = os.path.abspath(words_filename)
+    past_path = os.path.abspath(past_filename) if past_filename else None
+    path = compiled_index_path(words_path)
+    mtimes = (_file_mtime(path), _file_mtime(words_path), _file_mtime(past_path) if past_path else None)
+    key = (words_path, past_path)
+    cached = _COMPILED_INDEX_REGISTRY.get(key)
+    if cached is None or cached[0] != mtimes:
+        with _REGISTRY_LOCK:
+            cached = _COMPILED_INDEX_REGISTRY.get(key)
+            if cached is None or cached[0] != mtimes:
+                cached = _COMPILED_INDEX_REGISTRY[key] = (mtimes, _open_compiled_index(path, words_path, past_path))
+    compiled = cached[1]
+    return compiled if compiled is not None and compiled.word_length == word_length else None
+
+def _open_compiled_index(path, words_path, past_path):
+    """Maps and validates a compiled index file; None (logged) if it is missing, corrupt or stale."""
+    if _file_mtime(path) is None:
+        return None
+    try:
+        compiled = CompiledWordIndex(path)
+    except (OSError, ValueError) as error:
+        logger.warning("compiled_index_unreadable file=%s error=%s", path, error)
+        return None
+    if not compiled.matches(words_path, past_path):
+        logger.warning("compiled_index_stale file=%s (checksums differ; using the text files)", path)
+        return None
+    return compiled
+
+def compile_word_index(filename="words.txt", past_filename="past_used_words.txt", word_length=5,
+                       output=None, bitsets=True, patterns=False):
+    """
+    Compiles a words file (and its past answers file) into the binary index
+    format above and returns the path written (default compiled_index_path).
+    patterns=True also embeds the pattern matrix, which needs numpy.
+    """
+    if patterns and np is None:
+        raise RuntimeError("numpy is required to compile the pattern matrix")
+    with open(filename, 'rb') as file:
+        raw = file.read()
+    # Same parsing as _read_word_file, on the exact bytes that are checksummed
+    words = _parse_words(raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n').split('\n'), word_length)
+    past_raw = None
+    if past_filename:
+        try:
+            with open(past_filename, 'rb') as file:
+                past_raw = file.read()
+        except FileNotFoundError:
+            pass
+    past_words = _parse_past_words(past_raw.decode('utf-8')) if past_raw is not None else frozenset()
+
+    n = len(words)
+    row_bytes = (n + 7) // 8
+    excluded = _new_flags(n)
+    for i, word in enumerate(words):
+        if word in past_words:
+            excluded[i] = _FLAG_SET
+    # letters, excluded, bitsets, patterns; an omitted optional section is None with offset 0
+    sections = ["".join(words).encode('ascii').translate(_TO_LETTER_CODES),
+                _flags_to_int(excluded).to_bytes(row_bytes, 'little'), None, None]
+    flags = 0
+    if bitsets:
+        flags |= INDEX_FILE_BITSETS
+        index = WordIndex(words)
+        rows = [index.letter_at(pos, letter) for pos in range(word_length) for letter in ALPHABET]
+        rows += [index.count_at_least(letter, k) for letter in ALPHABET for k in range(1, word_length + 1)]
+        sections[2] = b"".join(bits.to_bytes(row_bytes, 'little') for bits in rows)
+    if patterns:
+        flags |= INDEX_FILE_PATTERNS
+        letter_codes = encode_words(words)
+        sections[3] = build_pattern_matrix(letter_codes, letter_codes).tobytes()
+
+    offsets = []
+    offset = _aligned(INDEX_FILE_HEADER.size)
+    for section in sections:
+        offsets.append(offset if section is not None else 0)
+        if section is not None:
+            offset = _aligned(offset + len(section))
+    header = INDEX_FILE_HEADER.pack(INDEX_FILE_MAGIC, INDEX_FILE_VERSION, word_length, n, flags,
+                                    hashlib.sha1(raw).digest(),
+                                    hashlib.sha1(past_raw).digest() if past_raw is not None else bytes(20),
+                                    *offsets)
+
+    path = output or compiled_index_path(filename)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        for section, section_offset in zip(sections, offsets):
+            if section is not None:
+                file.seek(section_offset)
+                file.write(section)
+    os.replace(tmp_path, path)
+    return path
+
+def validate_history(history, word_length=5):
+    """Returns an error string for a malformed [(guess, feedback), ...] list, else None."""
+    if not isinstance(history, list):
+        return "Game must be a list of [guess, feedback] pairs."
+    for pair in history:
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+            return "Game must be a list of [guess, feedback] pairs."
+        guess, feedback = pair
+        if not isinstance(guess, str) or len(guess) != word_length or not guess.isascii() or not guess.isalpha():
+            return f"Invalid guess: {guess!r}"
+        if not isinstance(feedback, str) or len(feedback) != word_length or not all(c in "GYX" for c in feedback.upper()):
+            return f"Invalid feedback string: {feedback!r}"
+    return None
+
+@timed("filter_batch_seconds")
+def filter_batch(index, histories, initial_mask=None):
+    """
+    Applies many independent guess histories at once.
+    histories is a list of [(guess, feedback), ...] lists; returns one candidate
+    bitmask per history, starting from initial_mask (default: every word).
+    With numpy, all games are narrowed together one turn at a time through the
+    pattern matrix; guesses outside the index and feedback Wordle can't produce
+    (see is_wordle_pattern) use the bitset path instead, so results always
+    match filter_words.
+    """
+    if initial_mask is None:
+        initial_mask = index.all_mask
+    if np is None or not histories:
+        masks = []
+        for history in histories:
+            mask = initial_mask
+            for guess, feedback in history:
+                mask = index.apply_feedback(mask, guess, feedback)
+            masks.append(mask)
+        return masks
+
+    matrix = index.pattern_matrix()
+    alive = np.tile(index.mask_to_bool(initial_mask), (len(histories), 1))
+    offmatrix = {}  # game -> [(guess, feedback)] for guesses the matrix can't answer
+    for turn in range(max(len(history) for history in histories)):
+        games, rows, codes = [], [], []
+        for game, history in enumerate(histories):
+            if turn >= len(history):
+                continue
+            guess, feedback = history[turn]
+            row = index.positions.get(guess)
+            if row is None or not is_wordle_pattern(guess, feedback):
+                offmatrix.setdefault(game, []).append((guess, feedback))
+            else:
+                games.append(game)
+                rows.append(row)
+                codes.append(encode_feedback(feedback))
+        if games:
+            # One gather + compare narrows every game that played a word this turn
+            alive[games] &= matrix[rows] == np.array(codes, dtype=matrix.dtype)[:, None]
+
+    masks = []
+    for game, selected in enumerate(alive):
+        mask = index.bool_to_mask(selected)
+        for guess, feedback in offmatrix.get(game, ()):
+            mask = index.apply_feedback(mask, guess, feedback)
+        masks.append(mask)
+    return masks
+
+_WORD_INDEX_REGISTRY = {}  # (abs words path, word length) -> WordIndex over the full (unexcluded) list
+_ADHOC_INDEXES = {}        # tuple of words -> WordIndex for lists not backed by a file
+
+def get_word_index(filename="words.txt", word_length=5):
+    """Returns the process-wide WordIndex for all words in filename, rebuilt when the file changes."""
+    word_list = get_word_list(filename=filename, exclude_past=False, word_length=word_length)
+    key = (os.path.abspath(filename), word_length)
+    index = _WORD_INDEX_REGISTRY.get(key)
+    if index is None or index.words is not word_list:
+        with _REGISTRY_LOCK:
+            index = _WORD_INDEX_REGISTRY.get(key)
+            if index is None or index.words is not word_list:
+                compiled = get_compiled_index(key[0], word_length)
+                if compiled is not None and compiled.words is word_list:
+                    index = WordIndex(word_list, source_path=key[0], bitsets=compiled.bitsets())
+                    if np is not None:
+                        index._letter_array = compiled.letter_array()
+                        index._pattern_matrix = compiled.pattern_matrix()
+                else:
+                    index = WordIndex(word_list, source_path=key[0])
+                # WordIndex copies via tuple(), which returns the same tuple object,
+                # so the identity check above tracks registry reloads.
+                _WORD_INDEX_REGISTRY[key] = index
+    return index
+
+# --- Dictionaries ---
+# Each dictionary is a word file (candidates and allowed guesses), an optional
+# past answers file and a word length. Registering one only records its config:
+# its WordIndex and pattern matrix are built on first use through the registries
+# above, so extra dictionaries cost nothing at startup or for other games.
+# Words must be a-z; entries with other characters are skipped when loading.
+DEFAULT_DICTIONARY = "default"
+DICTIONARIES = {
+    DEFAULT_DICTIONARY: {
+        "label": "Wordle answers",
+        "words": "words.txt",
+        "past": "past_used_words.txt",
+        "word_length": 5
+    }
+}
+
+def register_dictionary(name, words, past=None, word_length=5, label=None):
+    """Adds (or replaces) a dictionary in DICTIONARIES."""
+    if not 2 <= word_length <= 8:
+        raise ValueError("word_length must be between 2 and 8")
+    DICTIONARIES[name] = {"label": label or name, "words": words, "past": past, "word_length": word_length}
+
+def load_dictionaries(filename="dictionaries.json"):
+    """
+    Registers the dictionaries listed in a JSON file, if it exists:
+    {"name": {"words": "file.txt", "past": "past.txt", "word_length": 6, "label": "..."}}
+    """
+    try:
+        with open(filename, 'r') as file:
+            config = json.load(file)
+    except FileNotFoundError:
+        return DICTIONARIES
+    for name, options in config.items():
+        register_dictionary(name, **options)
+    return DICTIONARIES
+
+def get_dictionary(name=DEFAULT_DICTIONARY):
+    """Returns a dictionary's config, raising ValueError for unknown names."""
+    try:
+        return DICTIONARIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown dictionary: {name}") from None
+
+def get_dictionary_words(name=DEFAULT_DICTIONARY, exclude_past=False):
+    """The (cached) starting word list of a dictionary."""
+    dictionary = get_dictionary(name)
+    return get_word_list(filename=dictionary["words"], exclude_past=exclude_past,
+                         past_filename=dictionary["past"], word_length=dictionary["word_length"])
+
+def get_dictionary_index(name=DEFAULT_DICTIONARY):
+    """The (lazily built, cached) WordIndex over all words of a dictionary."""
+    dictionary = get_dictionary(name)
+    return get_word_index(filename=dictionary["words"], word_length=dictionary["word_length"])
+
+# --- Word list snapshots ---
+# The registries above notice changed files lazily, on the next call, which
+# puts the re-read on whichever request comes first. A WordListWatcher moves
+# that off the request path: a background thread polls the dictionaries' files
+# (past_used_words.txt gains an answer every day) and, when one changes, builds
+# a complete new WordListSnapshot before publishing it with a single reference
+# assignment. Readers take whatever snapshot is current and never wait; games
+# record the index digest they started with, and the last few snapshots stay
+# reachable through index_for so such games keep their own index even if the
+# words file itself changes. Once a game's snapshot has aged out index_for
+# returns None, and the app starts a new game rather than decode its bitmasks
+# against a different list.
+RETAINED_SNAPSHOTS = 3  # Published snapshots kept for games that started on them
+
+class WordListSnapshot:
+    """Every used dictionary's word lists, past answers and index at one version."""
+
+    def __init__(self, version, dictionaries=(DEFAULT_DICTIONARY,)):
+        self.version = version
+        self.created_at = time.time()
+        self._entries = {}  # dictionary name -> (all words, words without past answers, past words, index)
+        for name in dictionaries:
+            self._entry(name)
+
+    def _entry(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            # A dictionary's first use loads it into the current snapshot
+            dictionary = get_dictionary(name)
+            entry = (get_dictionary_words(name, exclude_past=False),
+                     get_dictionary_words(name, exclude_past=True),
+                     get_past_words(dictionary["past"]) if dictionary["past"] else frozenset(),
+                     get_dictionary_index(name))
+            self._entries[name] = entry
+        return entry
+
+    def dictionaries(self):
+        return tuple(self._entries)
+
+    def words(self, name=DEFAULT_DICTIONARY, exclude_past=False):
+        """A dictionary's starting word list."""
+        return self._entry(name)[1 if exclude_past else 0]
+
+    def past_words(self, name=DEFAULT_DICTIONARY):
+        return self._entry(name)[2]
+
+    def index(self, name=DEFAULT_DICTIONARY):
+        """The WordIndex over all of a dictionary's words."""
+        return self._entry(name)[3]
+
+class WordListWatcher:
+    """
+    Publishes WordListSnapshots, rebuilding them in a background thread when
+    the dictionaries' source files change. The thread is started on first use
+    in each process (so a pre-fork master never owns it); interval=0 never reloads.
+    """
+
+    def __init__(self, interval=30.0):
+        self.interval = interval
+        self.snapshot = None
+        self._retained = []  # Newest first, current snapshot included
+        self._signature = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _source_signature(self, names):
+        """mtimes of every file the snapshot was built from."""
+        signature = []
+        for name in names:
+            dictionary = get_dictionary(name)
+            paths = (dictionary["words"], compiled_index_path(dictionary["words"]), dictionary["past"])
+            signature.append((name,) + tuple(_file_mtime(path) if path else None for path in paths))
+        return tuple(signature)
+
+    def refresh(self):
+        """Builds and publishes a new snapshot if any source file changed. Returns True if it did."""
+        with self._lock:
+            names = self.snapshot.dictionaries() if self.snapshot is not None else (DEFAULT_DICTIONARY,)
+            signature = self._source_signature(names)
+            if self.snapshot is not None and signature == self._signature:
+                return False
+            version = self.snapshot.version + 1 if self.snapshot is not None else 1
+            snapshot = WordListSnapshot(version, names)  # All file I/O and index building happens here
+            self._signature = signature
+            self._retained = [snapshot] + self._retained[:RETAINED_SNAPSHOTS - 1]
+            self.snapshot = snapshot  # The swap: readers see the old or the new snapshot, never a mix
+        logger.info("word_lists_published version=%d dictionaries=%s", version, ",".join(names))
+        return True
+
+    def current(self):
+        """The current snapshot, starting the watcher thread in this process if needed."""
+        if self._pid != os.getpid():
+            self._start()
+        snapshot = self.snapshot
+        if snapshot is None:
+            self.refresh()  # Another thread is building the first one; wait for it
+            snapshot = self.snapshot
+        return snapshot
+
+    def index_for(self, name, digest=None):
+        """
+        The index of dictionary name with this digest from a retained snapshot,
+        the current one when digest is None, or None when no retained snapshot
+        has it (candidate bitmasks from that list can't be decoded any more).
+        """
+        current = self.current()
+        if digest is None:
+            return current.index(name)
+        for snapshot in self._retained:
+            if name in snapshot.dictionaries() and snapshot.index(name).digest == digest:
+                return snapshot.index(name)
+        return None
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            self._thread = None
+        if self.snapshot is None:
+            self.refresh()
+        if self.interval:
+            self._thread = threading.Thread(target=self._run, name="word-list-watcher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the last good snapshot (e.g. a file caught mid-write)
+                logger.exception("word_lists_refresh_failed")
+
+    def stop(self):
+        self._stop.set()
+
+def _index_covering(words):
+    """Returns a WordIndex containing every word in words, preferring the words.txt index."""
+    index = get_word_index()
+    positions = index.positions
+    if all(word in positions for word in words):
+        return index
+    key = tuple(words)
+    index = _ADHOC_INDEXES.get(key)
+    if index is None:
+        if len(_ADHOC_INDEXES) > 16:
+            _ADHOC_INDEXES.clear()
+        index = _ADHOC_INDEXES[key] = WordIndex(key)
+    return index
+
 def get_guess_and_feedback():
     """Gets the user's guess and Wordle's feedback."""
     print("\nAfter playing your guess in the Wordle game:")
@@ -119,10 +1068,104 @@ def get_guess_and_feedback():
     
     return guess, feedback_str
 
-def filter_words(possible_words, guess, feedback, known_letters, present_letters, absent_letters, yellow_misplaced):
-    """Filters the word list based on the feedback."""
-    new_possible_words = []
+# --- Accumulated constraints ---
+# Constraints is the compact form of everything learned from the feedback so far:
+# per-letter minimum/maximum counts and, per position, a 26-bit mask of letters
+# still allowed there. Merging a guess is O(word length), it serializes to a few
+# dozen bytes for game state, and compile() turns it into a WordIndex bitset query.
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+ALL_LETTERS_MASK = (1 << len(ALPHABET)) - 1
+
+class Constraints:
+    """Per-letter min/max counts and per-position allowed-letter bitmasks."""
+
+    __slots__ = ("word_length", "min_counts", "max_counts", "allowed")
+
+    def __init__(self, word_length=5):
+        self.word_length = word_length
+        self.min_counts = bytearray(len(ALPHABET))
+        self.max_counts = bytearray([word_length]) * len(ALPHABET)
+        self.allowed = [ALL_LETTERS_MASK] * word_length
+
+    def merge(self, guess, feedback):
+        """Adds one guess's feedback (same rules as WordIndex.apply_feedback)."""
+        non_gray_counts = {}
+        has_gray = set()
+        for pos, (letter, fb) in enumerate(zip(guess, feedback)):
+            bit = 1 << (ord(letter) - 97)
+            if fb == 'G':
+                self.allowed[pos] &= bit  # Contradicting an earlier guess leaves nothing allowed
+            else:
+                self.allowed[pos] &= ~bit
+            if fb == 'X':
+                has_gray.add(letter)
+            else:
+                non_gray_counts[letter] = non_gray_counts.get(letter, 0) + 1
+
+        for letter in set(guess):
+            i = ord(letter) - 97
+            count = non_gray_counts.get(letter, 0)
+            if count > self.min_counts[i]:
+                self.min_counts[i] = count
+            if letter in has_gray and count < self.max_counts[i]:
+                self.max_counts[i] = count
+        return self
+
+    def compile(self, index, mask=None):
+        """Bitset query form: the words of index (within mask) that satisfy every constraint."""
+        if mask is None:
+            mask = index.all_mask
+        for pos, allowed in enumerate(self.allowed):
+            if allowed != ALL_LETTERS_MASK:
+                for i, letter in enumerate(ALPHABET):
+                    if not (allowed >> i) & 1:
+                        mask &= ~index.letter_at(pos, letter)
+        for i, (low, high) in enumerate(zip(self.min_counts, self.max_counts)):
+            if low:
+                mask &= index.count_at_least(ALPHABET[i], low)
+            if high < self.word_length:
+                mask &= ~index.count_at_least(ALPHABET[i], high + 1)
+        return mask
 
+    def known_letters(self):
+        """Letter per position if pinned down (green), else None."""
+        known = []
+        for allowed in self.allowed:
+            is_single = allowed and not allowed & (allowed - 1)
+            known.append(ALPHABET[allowed.bit_length() - 1] if is_single else None)
+        return known
+
+    def present_letters(self):
+        """Sorted letters known to be in the word but not pinned to a position."""
+        known = set(self.known_letters())
+        return [letter for i, letter in enumerate(ALPHABET) if self.min_counts[i] and letter not in known]
+
+    def absent_letters(self):
+        """Sorted letters known not to be in the word."""
+        return [letter for i, letter in enumerate(ALPHABET) if self.max_counts[i] == 0]
+
+    def to_bytes(self):
+        """Serializes to 4 bytes per position plus one (min << 4 | max) byte per letter."""
+        data = bytearray([self.word_length])
+        for allowed in self.allowed:
+            data += allowed.to_bytes(4, 'little')
+        data += bytes((low << 4) | high for low, high in zip(self.min_counts, self.max_counts))
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        constraints = cls(data[0])
+        offset = 1
+        for pos in range(constraints.word_length):
+            constraints.allowed[pos] = int.from_bytes(data[offset:offset + 4], 'little')
+            offset += 4
+        counts = data[offset:offset + len(ALPHABET)]
+        constraints.min_counts = bytearray(byte >> 4 for byte in counts)
+        constraints.max_counts = bytearray(byte & 0x0F for byte in counts)
+        return constraints
+
+def update_knowledge(guess, feedback, known_letters, present_letters, absent_letters, yellow_misplaced):
+    """Records one guess's feedback in the known/present/absent/yellow collections (in place)."""
     # Update knowledge based on feedback
     for i, (letter, fb) in enumerate(zip(guess, feedback)):
         if fb == 'G':
@@ -146,115 +1189,577 @@ def filter_words(possible_words, guess, feedback, known_letters, present_letters
             if not is_letter_green_or_yellow_in_guess and letter not in known_letters:
                  absent_letters.add(letter)
 
+@timed("filter_words_seconds")
+def filter_words(possible_words, guess, feedback, known_letters, present_letters, absent_letters, yellow_misplaced,
+                 index=None):
+    """
+    Filters the word list based on the feedback. index, if given, must contain possible_words.
+    For callers that track the loose known/present/absent/yellow collections;
+    the app and the CLI merge feedback into a Constraints and filter with compile().
+    """
+    update_knowledge(guess, feedback, known_letters, present_letters, absent_letters, yellow_misplaced)
 
-    for word in possible_words:
-        valid = True
-        temp_present_letters = set(present_letters) # Copy for local check
+    # The candidates were already narrowed by earlier guesses, so only this
+    # guess's feedback needs to be applied, as bitset operations on an index.
+    if index is None:
+        index = _index_covering(possible_words)
+    mask = index.apply_feedback(index.mask_for(possible_words), guess, feedback)
+    survivors = set(index.words_for(mask))
+    return [word for word in possible_words if word in survivors]
 
-        # 1. Green Check: Check for letters in known positions
-        for i, known_letter in enumerate(known_letters):
-            if known_letter and word[i] != known_letter:
-                valid = False
-                break
-        if not valid:
-            continue
+# --- Guess scoring strategies ---
+# Strategies are plain functions called as fn(possible_words, index, context)
+# where index is a WordIndex covering possible_words and context is a dict with
+# "tried_letters", "rng" (a random.Random seeded by the candidate set, for
+# deterministic tie-breaking), "time_budget", "candidates_mask" and "hard_mode"
+# (only suggest words from possible_words when True). A strategy
+# returns a guess, or None to defer to the "frequency" heuristic for this call
+# (such fallbacks are not memoized). Register new ones with @register_strategy.
+SUGGESTION_STRATEGIES = {}  # name -> strategy function
+UNIQUENESS_WEIGHT = 0.2     # Frequency heuristic bonus per distinct letter
+ENTROPY_TIME_BUDGET = 0.05  # Seconds; past this, entropy scoring falls back to "frequency"
+ENTROPY_BATCH_ROWS = 512    # Guesses scored per vectorized block
+PATTERN_MATRIX_STRATEGIES = frozenset(("entropy", "minimax", "optimal"))  # Strategies that score with the pattern matrix
 
-        # 2. Yellow Check (misplaced letters)
-        for i, yellow_set_at_pos in enumerate(yellow_misplaced):
-            if word[i] in yellow_set_at_pos: # Letter is in a known yellow position
-                valid = False
-                break
-        if not valid:
-            continue
-        
-        # Count letters in the current word to handle duplicates correctly for yellow/gray
-        word_letter_counts = {}
-        for char_in_word in word:
-            word_letter_counts[char_in_word] = word_letter_counts.get(char_in_word, 0) + 1
-        
-        # Combined Yellow & Gray check (more robust for duplicates)
-        for i, char_in_word in enumerate(word):
-            # Gray check part 1: if a letter is truly absent
-            if char_in_word in absent_letters and known_letters[i] != char_in_word and char_in_word not in present_letters:
-                valid = False
+class SuggestionCache:
+    """
+    Bounded LRU cache of suggestions keyed by (word index digest, candidate
+    bitmask, strategy). Many players reach the same candidate sets, so repeated
+    states skip scoring entirely.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the cached suggestion for key, or None."""
+        with self._lock:
+            suggestion = self._entries.get(key)
+            if suggestion is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return suggestion
+
+    def put(self, key, suggestion):
+        with self._lock:
+            self._entries[key] = suggestion
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        """Hit/miss/size statistics, like functools' cache_info()."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
+
+SUGGESTION_CACHE = SuggestionCache()
+
+def suggestion_cache_key(index, candidates_mask, strategy, hard_mode=False):
+    """Key under which suggest_next_guess memoizes a suggestion."""
+    return (index.digest, candidates_mask, strategy, hard_mode)
+
+def cached_suggestion(index, candidates_mask, strategy, hard_mode=False):
+    """Memoized suggestion for a candidate set, or None."""
+    return SUGGESTION_CACHE.get(suggestion_cache_key(index, candidates_mask, strategy, hard_mode))
+
+def cache_suggestion(index, candidates_mask, strategy, hard_mode, suggestion):
+    """Stores a suggestion computed elsewhere (e.g. in a worker process) in SUGGESTION_CACHE."""
+    SUGGESTION_CACHE.put(suggestion_cache_key(index, candidates_mask, strategy, hard_mode), suggestion)
+
+def register_strategy(name):
+    """Decorator registering a strategy function under name for suggest_next_guess."""
+    def decorator(fn):
+        SUGGESTION_STRATEGIES[name] = fn
+        return fn
+    return decorator
+
+def suggestion_cache_info():
+    """Statistics for the process-wide suggestion cache."""
+    return SUGGESTION_CACHE.info()
+
+@timed("suggest_seconds")
+def suggest_next_guess(possible_words, tried_letters=None, strategy="frequency", time_budget=ENTROPY_TIME_BUDGET,
+                       use_cache=True, hard_mode=False, index=None):
+    """
+    Suggests a next guess from the list of possible words.
+    strategy names a function in SUGGESTION_STRATEGIES.
+    strategy="frequency" scores candidates by letter and position frequency;
+    "frequency_top1" is the same heuristic without the top-3 pick.
+    strategy="entropy" picks the allowed guess whose feedback pattern distribution
+    over the candidates has the highest entropy, falling back to "frequency" when
+    numpy is unavailable or scoring would exceed time_budget seconds.
+    strategy="minimax" minimizes the worst case instead: the largest feedback
+    bucket, or for small candidate sets the guesses needed to surely solve
+    (see minimax_plan); it uses the time budget the same way.
+    strategy="optimal" plays the precomputed decision tree (see decision_tree.py)
+    and otherwise behaves like "entropy".
+    hard_mode=True restricts suggestions to words consistent with all feedback
+    so far, i.e. to possible_words. index is the WordIndex to score against
+    (default: the words.txt index, or an ad hoc one if the words aren't in it).
+    Results are deterministic for a given candidate set and memoized in SUGGESTION_CACHE.
+    """
+    if strategy not in SUGGESTION_STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if not possible_words:
+        return None
+    observe("suggest_candidates", len(possible_words), strategy=strategy)
+
+    # The candidate bitmask is both the cache key and the seed for the
+    # frequency heuristic's top-3 pick, so a cache hit and a fresh
+    # computation always agree.
+    if index is None:
+        index = _index_covering(possible_words)
+    candidates_mask = index.mask_for(possible_words)
+    key = suggestion_cache_key(index, candidates_mask, strategy, hard_mode)
+    if use_cache:
+        cached = SUGGESTION_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    context = {
+        "tried_letters": tried_letters,
+        "rng": random.Random(candidates_mask),
+        "time_budget": time_budget,
+        "candidates_mask": candidates_mask,
+        "hard_mode": hard_mode
+    }
+    suggestion = SUGGESTION_STRATEGIES[strategy](possible_words, index, context)
+    if suggestion is None:
+        # E.g. over budget: answer with the heuristic but don't memoize it for this strategy
+        return _suggest_by_frequency(possible_words, tried_letters, context["rng"], index=index)
+
+    if use_cache:
+        SUGGESTION_CACHE.put(key, suggestion)
+    return suggestion
+
+def _suggest_by_entropy(possible_words, index, time_budget, hard_mode=False):
+    """Highest-entropy guess over the whole index (or just the candidates in hard mode), or None if the time budget ran out."""
+    deadline = time.perf_counter() + time_budget
+    matrix = index.pattern_matrix()
+    candidates = np.fromiter((index.positions[word] for word in possible_words), dtype=np.intp, count=len(possible_words))
+    if time.perf_counter() > deadline:
+        return None
+
+    guesses = candidates if hard_mode else None
+    scores = pattern_entropies(matrix, candidates, guesses, deadline=deadline, word_length=index.word_length)
+    if scores is None:
+        return None
+    if hard_mode:
+        return index.words[candidates[int(np.argmax(scores))]]
+
+    # Prefer a guess that could itself be the answer when entropies tie
+    best = scores.max()
+    tied = np.flatnonzero(scores >= best - 1e-9)
+    is_candidate = np.isin(tied, candidates)
+    return index.words[tied[is_candidate][0] if is_candidate.any() else tied[0]]
+
+def pattern_entropies(matrix, candidates, guesses=None, deadline=None, word_length=5):
+    """
+    Entropy (bits) of each guess's feedback pattern distribution over candidates.
+    matrix is a pattern matrix, candidates/guesses are arrays of its answer/guess
+    indices (guesses defaults to every row). Returns None if deadline
+    (a time.perf_counter() value) passes before all batches are scored.
+    """
+    if guesses is None:
+        guesses = np.arange(matrix.shape[0])
+    n_candidates = len(candidates)
+    n_patterns = 3 ** word_length
+    scores = np.empty(len(guesses), dtype=np.float64)
+    columns = matrix[:, candidates] if len(guesses) == matrix.shape[0] else None
+
+    for start in range(0, len(guesses), ENTROPY_BATCH_ROWS):
+        batch = guesses[start:start + ENTROPY_BATCH_ROWS]
+        block = columns[batch] if columns is not None else matrix[np.ix_(batch, candidates)]
+        counts = _bucket_counts(block, n_patterns).astype(np.float64)
+        # H = log2(n) - sum(c * log2(c)) / n over the non-empty buckets
+        c_log_c = counts * np.log2(np.where(counts > 0, counts, 1))
+        scores[start:start + len(batch)] = np.log2(n_candidates) - c_log_c.sum(axis=1) / n_candidates
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+    return scores
+
+def _bucket_counts(block, n_patterns):
+    """(rows, n_patterns) number of candidates per pattern code for each row of a pattern block."""
+    # One bincount for the whole block: offset each row into its own n_patterns-slot range
+    offsets = (np.arange(len(block)) * n_patterns)[:, None]
+    counts = np.bincount((block + offsets).ravel(), minlength=len(block) * n_patterns)
+    return counts.reshape(len(block), n_patterns)
+
+def pattern_worst_cases(matrix, candidates, guesses=None, deadline=None, word_length=5):
+    """
+    Largest feedback bucket and number of distinct patterns of each guess over
+    candidates, as two arrays; arguments as for pattern_entropies. Returns None
+    if deadline passes before all batches are scored.
+    """
+    if guesses is None:
+        guesses = np.arange(matrix.shape[0])
+    n_patterns = 3 ** word_length
+    largest = np.empty(len(guesses), dtype=np.intp)
+    distinct = np.empty(len(guesses), dtype=np.intp)
+    for start in range(0, len(guesses), ENTROPY_BATCH_ROWS):
+        batch = guesses[start:start + ENTROPY_BATCH_ROWS]
+        counts = _bucket_counts(matrix[np.ix_(batch, candidates)], n_patterns)
+        largest[start:start + len(batch)] = counts.max(axis=1)
+        distinct[start:start + len(batch)] = np.count_nonzero(counts, axis=1)
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+    return largest, distinct
+
+# --- Minimax ---
+# "minimax" picks the guess whose largest feedback bucket is smallest, i.e. the
+# best worst case one guess ahead (ties: more distinct patterns, then guesses
+# that could be the answer). For small candidate sets it then searches deeper
+# for the guess that guarantees a solve in the fewest guesses: a depth-first
+# min-max over feedback buckets that stops exploring a guess as soon as one of
+# its buckets can't beat the best guess found so far, and tries guesses in
+# worst-case order, limited to MINIMAX_SEARCH_BRANCHING per node. Results for
+# candidate sets are memoized across requests in _MINIMAX_MEMO.
+MINIMAX_SEARCH_MAX_CANDIDATES = 50  # Deeper search only at or below this many candidates
+MINIMAX_SEARCH_DEPTH = 6            # Guesses the search may plan for (a full Wordle game)
+MINIMAX_SEARCH_BRANCHING = 24       # Guesses tried per search node
+MINIMAX_SEARCH_TIME_LIMIT = 1.0     # Seconds; caps the search even with an unlimited time_budget
+MINIMAX_MEMO_MAX = 200000           # Memoized candidate sets before the memo is cleared
+
+_MINIMAX_MEMO = {}  # (index digest, hard_mode, candidate indices bytes) -> (guesses needed, exact?)
+
+class _SearchTimeout(Exception):
+    pass
+
+def _worst_case_order(largest, distinct, is_candidate):
+    """Guess order for minimax: smallest largest bucket, then most patterns, then possible answers first."""
+    return np.lexsort((~is_candidate, -distinct, largest))
+
+def _minimax_search(index, candidates, limit, deadline, hard_mode):
+    """
+    Fewest guesses that surely solve the sorted index array candidates, and
+    the guess (an index position) to play first; (limit + 1, None) if it takes
+    more than limit guesses. Raises _SearchTimeout past deadline.
+    """
+    n = len(candidates)
+    if n == 1:
+        return (1, int(candidates[0])) if limit >= 1 else (limit + 1, None)
+    if limit < 2:
+        return limit + 1, None
+    if n == 2:
+        return 2, int(candidates[0])
+
+    key = (index.digest, hard_mode, candidates.tobytes())
+    known = _MINIMAX_MEMO.get(key)
+    if known is not None:
+        (needed, guess), exact = known
+        if needed > limit:
+            return limit + 1, None
+        if exact:
+            return needed, guess
+    if time.perf_counter() > deadline:
+        raise _SearchTimeout()
+
+    matrix = index.pattern_matrix()
+    guesses = candidates if hard_mode else np.arange(len(index))
+    largest, distinct = pattern_worst_cases(matrix, candidates, guesses, word_length=index.word_length)
+    is_candidate = np.isin(guesses, candidates, assume_unique=True)
+    order = _worst_case_order(largest, distinct, is_candidate)[:MINIMAX_SEARCH_BRANCHING]
+    solved_code = 3 ** index.word_length - 1  # All green
+
+    best, best_guess = limit + 1, None
+    for row in order:
+        if largest[row] == n:
+            continue  # Tells nothing apart
+        guess = int(guesses[row])
+        patterns = matrix[guess, candidates]
+        codes, sizes = np.unique(patterns, return_counts=True)
+        # To beat best, every bucket must be solved within best - 2 more guesses;
+        # the largest buckets are the likeliest to fail, so try them first
+        worst = 0
+        for code in codes[np.argsort(-sizes, kind='stable')]:
+            if code == solved_code:
+                continue
+            needed, _ = _minimax_search(index, candidates[patterns == code], best - 2, deadline, hard_mode)
+            worst = max(worst, needed)
+            if worst > best - 2:
                 break
-            
-            # Track if present letters are actually found
-            if char_in_word in temp_present_letters:
-                temp_present_letters.remove(char_in_word) # Mark as found
-        
-        if not valid:
-            continue
+        if 1 + worst < best:
+            best, best_guess = 1 + worst, guess
+            if best == 2:
+                break  # Can't do better with more than one candidate
 
-        # Yellow check part 2: All present_letters must be in the word
-        if len(temp_present_letters) > 0: # Some yellow letters were not found
-            valid = False
-            continue
+    if len(_MINIMAX_MEMO) >= MINIMAX_MEMO_MAX:
+        _MINIMAX_MEMO.clear()
+    # A failure only says "more than limit"; a success is the minimum over the guesses tried
+    _MINIMAX_MEMO[key] = ((best, best_guess), best <= limit)
+    return best, best_guess
 
-        # Edge case for gray letters with duplicates in guess vs solution
-        # e.g., guess 'SPOON', feedback 'XXXYX', answer 'BLOCK' (O is absent)
-        # e.g., guess 'APPLE', feedback 'YXXXG', answer 'PLATE' (one P is present, not at pos 0, E is at pos 4)
-        # The absent_letters logic already handles cases like "SPEED" (E is gray) vs "TREES" (E is green).
-        # What needs more care: if 'P' in 'APPLE' is Gray, but the word is 'PAPER' (one P)
-        # current absent_letters logic: adds to absent if not G/Y *in current guess*.
-        # This is mostly handled by ensuring that a letter isn't added to absent_letters if it's also G/Y.
-        # The more complex part is when a guessed letter (e.g. 'P' in "APPLE") has one instance 'Y' and another 'X'.
-        # This implies exactly one 'P'.
-        
-        # Count occurrences of letters from the guess in the current `word`
-        # to compare against non-gray occurrences in the `guess`.
-        guess_letter_counts = {}
-        non_gray_guess_letters = []
-        for gl, gf in zip(guess, feedback):
-            if gf != 'X':
-                non_gray_guess_letters.append(gl)
-                guess_letter_counts[gl] = guess_letter_counts.get(gl, 0) + 1
-
-        for letter_to_check_count in guess_letter_counts:
-            count_in_word = word.count(letter_to_check_count)
-            # If a letter was guessed (e.g., two 'P's in 'APPLE') and one 'P' is gray,
-            # it means the count of that letter in the solution is *exactly* the number of non-gray P's.
-            # Check if any letter from the guess was marked gray
-            gray_instances_of_letter_in_guess = 0
-            non_gray_instances_of_letter_in_guess = 0
-            for gl, gf in zip(guess, feedback):
-                if gl == letter_to_check_count:
-                    if gf == 'X':
-                        gray_instances_of_letter_in_guess +=1
-                    else:
-                        non_gray_instances_of_letter_in_guess +=1
-            
-            if gray_instances_of_letter_in_guess > 0: # This letter appeared as gray in the guess
-                if count_in_word != non_gray_instances_of_letter_in_guess:
-                    valid = False
-                    break
-            else: # This letter only appeared as G/Y in the guess
-                if count_in_word < non_gray_instances_of_letter_in_guess:
-                    valid = False # Word must contain at least as many as non-gray guess instances
-                    break
-        if not valid:
+def minimax_plan(possible_words, index=None, max_guesses=MINIMAX_SEARCH_DEPTH, time_budget=MINIMAX_SEARCH_TIME_LIMIT,
+                 hard_mode=False):
+    """
+    (guess, guesses needed) such that playing guess and then following the
+    search solves every word in possible_words within that many guesses, or
+    None if no such plan within max_guesses was found in time_budget seconds.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for the minimax search")
+    if not possible_words:
+        return None
+    if index is None:
+        index = _index_covering(possible_words)
+    candidates = np.sort(np.fromiter((index.positions[word] for word in possible_words), dtype=np.intp,
+                                     count=len(possible_words)))
+    try:
+        needed, guess = _minimax_search(index, candidates, max_guesses, time.perf_counter() + time_budget, hard_mode)
+    except _SearchTimeout:
+        return None
+    return (index.words[guess], needed) if guess is not None else None
+
+def _suggest_by_minimax(possible_words, index, time_budget, hard_mode=False):
+    """Best worst-case guess (see "Minimax" above), or None if the time budget ran out before the one-step pass."""
+    deadline = time.perf_counter() + time_budget
+    matrix = index.pattern_matrix()
+    candidates = np.sort(np.fromiter((index.positions[word] for word in possible_words), dtype=np.intp,
+                                     count=len(possible_words)))
+    guesses = candidates if hard_mode else np.arange(len(index))
+    worst_cases = pattern_worst_cases(matrix, candidates, guesses, deadline=deadline, word_length=index.word_length)
+    if worst_cases is None:
+        return None
+    is_candidate = np.isin(guesses, candidates, assume_unique=True)
+    suggestion = index.words[guesses[_worst_case_order(*worst_cases, is_candidate)[0]]]
+
+    if len(candidates) <= MINIMAX_SEARCH_MAX_CANDIDATES:
+        # Whatever is left of the budget (capped) goes to the deeper search; on timeout keep the one-step pick
+        search_deadline = min(deadline, time.perf_counter() + MINIMAX_SEARCH_TIME_LIMIT)
+        try:
+            _, guess = _minimax_search(index, candidates, MINIMAX_SEARCH_DEPTH, search_deadline, hard_mode)
+        except _SearchTimeout:
+            guess = None
+        if guess is not None:
+            suggestion = index.words[guess]
+    return suggestion
+
+# --- Decision trees ---
+# decision_tree.py builds, offline, a complete strategy tree for a starting
+# word list: the guess to play for every candidate set reachable from a fixed
+# opener, chosen to minimize the expected number of guesses. The "optimal"
+# strategy serves it: nodes are found by a fingerprint of the candidate set,
+# so a lookup is one hash of possible_words and one dict access, and any game
+# that reaches a set in the tree gets the tree's guess however it got there.
+# Sets outside the tree (a different opener, list or off-tree guesses) fall
+# back to "entropy".
+#
+# File layout (JSON):
+#   {"version": 1, "opener": ..., "hard_mode": bool, "breadth": int,
+#    "answers": N, "total_guesses": T, "tree": <node>}
+#   node = [guess, candidates_fingerprint, {"feedback string": <node>}]
+DECISION_TREE_VERSION = 1
+DECISION_TREE_FILENAME = "decision_tree.json"
+
+_DECISION_TREE_REGISTRY = {}  # abs path -> (mtime, (tree, {fingerprint: guess}) or None)
+
+def candidates_fingerprint(words):
+    """Order-independent fingerprint of a candidate set."""
+    return word_list_digest(sorted(words))
+
+def load_decision_tree(filename=DECISION_TREE_FILENAME):
+    """
+    Returns (tree, {candidates fingerprint: guess}) for a decision tree file,
+    or None if there is no valid one. Cached; re-read when the file changes.
+    """
+    path = os.path.abspath(filename)
+    mtime = _file_mtime(path)
+    cached = _DECISION_TREE_REGISTRY.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _REGISTRY_LOCK:
+        loaded = None
+        if mtime is not None:
+            try:
+                with open(path, 'r') as file:
+                    tree = json.load(file)
+                if tree.get("version") != DECISION_TREE_VERSION:
+                    raise ValueError(f"unsupported version {tree.get('version')}")
+            except (OSError, ValueError) as error:
+                logger.warning("decision_tree_unreadable file=%s error=%s", path, error)
+            else:
+                guesses = {}
+                stack = [tree["tree"]]
+                while stack:
+                    guess, fingerprint, children = stack.pop()
+                    guesses[fingerprint] = guess
+                    stack.extend(children.values())
+                loaded = (tree, guesses)
+        _DECISION_TREE_REGISTRY[path] = (mtime, loaded)
+        return loaded
+
+def lookup_decision_tree(possible_words, hard_mode=False, filename=DECISION_TREE_FILENAME):
+    """The decision tree's guess for this candidate set, or None if the tree doesn't cover it."""
+    loaded = load_decision_tree(filename)
+    if loaded is None:
+        return None
+    tree, guesses = loaded
+    if hard_mode and not tree["hard_mode"]:
+        return None  # Its guesses may break hard mode's rules
+    return guesses.get(candidates_fingerprint(possible_words))
+
+# --- Multi-board games ---
+# Dordle/Quordle-style variants play every guess on N boards at once, each with
+# its own hidden answer. A multi-board game is a list of candidate bitmasks over
+# one shared WordIndex, one per board. apply_feedback_multi narrows all boards
+# in one pass: with numpy, the guess's pattern matrix row is compared against
+# every board's feedback code together. suggest_multi_board scores each allowed
+# guess by the information it gives across the unsolved boards: the answers are
+# independent, so the joint entropy of the N feedback patterns is the sum of the
+# per-board entropies. Boards with the same candidate set (all of them before
+# the first guess) are scored once, and a board down to one candidate is played
+# outright, since that guess is needed anyway.
+MULTI_BOARD_TIME_BUDGET = 0.25  # Seconds; past this, the frequency heuristic answers for the smallest board
+
+@timed("apply_feedback_multi_seconds")
+def apply_feedback_multi(index, masks, guess, feedbacks):
+    """
+    Narrows every board's candidate bitmask with one guess. feedbacks has one
+    feedback string per board, or None for a board that is already solved
+    (its mask is returned unchanged). Same semantics as filter_words: feedback
+    Wordle can't produce uses the bitset path (see is_wordle_pattern).
+    """
+    row = index.positions.get(guess) if np is not None else None
+    masks = list(masks)
+    boards = []  # Boards narrowed through the pattern matrix
+    for board, feedback in enumerate(feedbacks):
+        if feedback is None:
             continue
+        if row is None or not is_wordle_pattern(guess, feedback):
+            masks[board] = index.apply_feedback(masks[board], guess, feedback)
+        else:
+            boards.append(board)
+    if boards:
+        patterns = index.pattern_matrix()[row]
+        codes = np.array([encode_feedback(feedbacks[board]) for board in boards], dtype=patterns.dtype)
+        alive = np.stack([index.mask_to_bool(masks[board]) for board in boards])
+        alive &= patterns == codes[:, None]
+        for board, selected in zip(boards, alive):
+            masks[board] = index.bool_to_mask(selected)
+    return masks
 
+@timed("suggest_multi_board_seconds")
+def suggest_multi_board(index, masks, time_budget=MULTI_BOARD_TIME_BUDGET, use_cache=True):
+    """
+    Suggests one guess for all boards given the candidate bitmasks of the
+    unsolved ones (see "Multi-board games" above), or None if none has
+    candidates left. Memoized in SUGGESTION_CACHE by the set of boards.
+    """
+    masks = sorted(mask for mask in masks if mask)
+    if not masks:
+        return None
+    observe("suggest_candidates", sum(index.count(mask) for mask in masks), strategy="multi_board")
+    key = suggestion_cache_key(index, tuple(masks), "multi_board")
+    if use_cache:
+        cached = SUGGESTION_CACHE.get(key)
+        if cached is not None:
+            return cached
 
-        if valid:
-            new_possible_words.append(word)
-            
-    return new_possible_words
+    suggestion = _suggest_multi_board_by_entropy(index, masks, time_budget) if np is not None else None
+    if suggestion is None:
+        # No numpy or over budget: a board's last candidate if there is one, else the heuristic for the smallest board
+        smallest = min(masks, key=index.count)
+        if index.count(smallest) == 1:
+            return index.words_for(smallest)[0]
+        return _suggest_by_frequency(index.words_for(smallest), rng=random.Random(smallest), index=index)
+
+    if use_cache:
+        SUGGESTION_CACHE.put(key, suggestion)
+    return suggestion
 
-def suggest_next_guess(possible_words, tried_letters=None):
-    """Suggests a next guess from the list of possible words."""
+def _suggest_multi_board_by_entropy(index, masks, time_budget):
+    """Guess with the highest summed entropy over the boards, or None if the time budget ran out."""
+    deadline = time.perf_counter() + time_budget
+    matrix = index.pattern_matrix()
+    scores = np.zeros(len(index), dtype=np.float64)
+    is_candidate = np.zeros(len(index), dtype=bool)
+    forced = []  # Only remaining candidate of some board
+    for mask, boards in Counter(masks).items():
+        candidates = index.mask_to_indices(mask)
+        is_candidate[candidates] = True
+        if len(candidates) == 1:
+            forced.append(int(candidates[0]))
+            continue  # Its own feedback tells nothing new
+        entropies = pattern_entropies(matrix, candidates, deadline=deadline, word_length=index.word_length)
+        if entropies is None:
+            return None
+        scores += boards * entropies
+
+    if forced:
+        return index.words[max(forced, key=lambda i: (scores[i], -i))]
+    # Prefer a guess that could solve a board when scores tie
+    tied = np.flatnonzero(scores >= scores.max() - 1e-9)
+    on_board = is_candidate[tied]
+    return index.words[tied[on_board][0] if on_board.any() else tied[0]]
+
+NUMPY_RANKING_MIN_WORDS = 32  # Below this the plain Python scorer is as fast
+
+def rank_by_frequency(possible_words, uniqueness_weight=UNIQUENESS_WEIGHT, index=None, limit=None):
+    """
+    Scores words with the letter/position frequency heuristic; returns (word, score)
+    pairs, best first (only the first limit pairs if limit is given).
+    """
     if not possible_words:
+        return []
+    if np is not None and len(possible_words) >= NUMPY_RANKING_MIN_WORDS:
+        ranked = _rank_by_frequency_numpy(possible_words, uniqueness_weight, index, limit)
+        if ranked is not None:
+            return ranked
+    return _rank_by_frequency_python(possible_words, uniqueness_weight)[:limit]
+
+def _rank_by_frequency_numpy(possible_words, uniqueness_weight, index=None, limit=None):
+    """
+    Vectorized rank_by_frequency over the index's (N, L) letter array: bincount
+    for both frequency tables, one gather per position for the scores. The
+    float operations run in the same order as the Python scorer, so scores are
+    bit-identical and the stable sort gives the same ranking, ties included.
+    Returns None if the words contain duplicates (the Python scorer dedups them).
+    """
+    if index is None:
+        index = _index_covering(possible_words)
+    positions = index.positions
+    rows = np.fromiter((positions[word] for word in possible_words), dtype=np.intp, count=len(possible_words))
+    if np.bincount(rows, minlength=len(index)).max() > 1:
         return None
-    
-    if len(possible_words) == 1:
-        return possible_words[0]  # Only one word left, must be the answer
-        
-    if len(possible_words) <= 2:
-        return random.choice(possible_words)  # With just 2 options, either is a good guess
-    
+    letters = index.letter_array()[rows]
+    n_words, word_length = letters.shape
+    n_letters = len(ALPHABET)
+
+    # first[:, i]: letter i is the word's first occurrence of that letter
+    first = np.ones(letters.shape, dtype=bool)
+    for i in range(1, word_length):
+        first[:, i] = ~(letters[:, :i] == letters[:, i:i + 1]).any(axis=1)
+    letter_freq = np.bincount(letters[first], minlength=n_letters)
+    position_freq = [np.bincount(letters[:, i], minlength=n_letters) for i in range(word_length)]
+
+    scores = np.zeros(n_words, dtype=np.float64)
+    for i in range(word_length):
+        freq_score = letter_freq[letters[:, i]] / n_words
+        scores += np.where(first[:, i], freq_score, 0.0)
+        scores += position_freq[i][letters[:, i]] / n_words
+    scores += first.sum(axis=1) * uniqueness_weight
+
+    order = np.argsort(-scores, kind='stable')[:limit]
+    words = index.words
+    return [(words[rows[j]], score) for j, score in zip(order.tolist(), scores[order].tolist())]
+
+def _rank_by_frequency_python(possible_words, uniqueness_weight=UNIQUENESS_WEIGHT):
+    """Reference implementation of rank_by_frequency with dicts and nested loops."""
     # Use letter frequency to determine best guess
     letter_freq = {}
-    position_freq = [{} for _ in range(5)]  # For each position, track the frequency of each letter
+    position_freq = [{} for _ in range(len(possible_words[0]))]  # For each position, track the frequency of each letter
     
     # Count letter frequencies in remaining possible words
     for word in possible_words:
@@ -290,12 +1795,25 @@ def suggest_next_guess(possible_words, tried_letters=None):
             
         # Unique letters bonus: prefer words with unique letters
         unique_letters_count = len(set(word))
-        score += unique_letters_count * 0.2  # Weight for uniqueness
+        score += unique_letters_count * uniqueness_weight  # Weight for uniqueness
         
         word_scores[word] = score
     
     # Sort by score (highest first)
-    sorted_words = sorted(word_scores.items(), key=lambda x: x[1], reverse=True)
+    return sorted(word_scores.items(), key=lambda x: x[1], reverse=True)
+
+def _suggest_by_frequency(possible_words, tried_letters=None, rng=random, uniqueness_weight=UNIQUENESS_WEIGHT, top_n=3, index=None):
+    """Letter and position frequency heuristic, picking among the top_n with rng for large lists."""
+    if not possible_words:
+        return None
+    
+    if len(possible_words) == 1:
+        return possible_words[0]  # Only one word left, must be the answer
+        
+    if len(possible_words) <= 2:
+        return rng.choice(possible_words)  # With just 2 options, either is a good guess
+    
+    sorted_words = rank_by_frequency(possible_words, uniqueness_weight, index, limit=top_n)
     
     # Return the highest scoring word
     best_word = sorted_words[0][0]
@@ -306,13 +1824,57 @@ def suggest_next_guess(possible_words, tried_letters=None):
         # with lots of common letters to gain information, even if it's not a possible answer
         
         # Get top 3 words as candidates to add randomness to suggestions
-        top_candidates = [word for word, score in sorted_words[:3]]
-        return random.choice(top_candidates)
+        top_candidates = [word for word, score in sorted_words[:top_n]]
+        return rng.choice(top_candidates)
     
     return best_word
 
+def iter_candidates(index, mask, sort="alpha"):
+    """
+    Lazily yields a candidate bitmask's words for paging: sort="alpha" (or
+    "index") streams straight off the bitmask, sort="score" ranks by the
+    frequency heuristic first.
+    """
+    if sort == "score":
+        for word, _ in rank_by_frequency(index.words_for(mask), index=index):
+            yield word
+    else:
+        yield from index.iter_words(mask, sort)
+
+@register_strategy("frequency")
+def _frequency_strategy(possible_words, index, context):
+    return _suggest_by_frequency(possible_words, context["tried_letters"], context["rng"], index=index)
+
+@register_strategy("frequency_top1")
+def _frequency_top1_strategy(possible_words, index, context):
+    return _suggest_by_frequency(possible_words, context["tried_letters"], context["rng"], top_n=1, index=index)
+
+@register_strategy("entropy")
+def _entropy_strategy(possible_words, index, context):
+    if np is None:
+        return None
+    if len(possible_words) <= 2:
+        return _suggest_by_frequency(possible_words, context["tried_letters"], context["rng"], index=index)
+    return _suggest_by_entropy(possible_words, index, context["time_budget"], context["hard_mode"])
+
+@register_strategy("minimax")
+def _minimax_strategy(possible_words, index, context):
+    if np is None:
+        return None
+    if len(possible_words) <= 2:
+        return _suggest_by_frequency(possible_words, context["tried_letters"], context["rng"], index=index)
+    return _suggest_by_minimax(possible_words, index, context["time_budget"], context["hard_mode"])
+
+@register_strategy("optimal")
+def _optimal_strategy(possible_words, index, context):
+    suggestion = lookup_decision_tree(possible_words, context["hard_mode"])
+    if suggestion is None:
+        return _entropy_strategy(possible_words, index, context)
+    return suggestion
+
 def main():
     """Main function to run the Wordle solver."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     # First load past used words to exclude them
     load_past_words()
     
@@ -324,12 +1886,10 @@ def main():
 
     possible_words = list(all_words)
     
-    # Data to track across guesses
-    known_letters = [None] * 5  # Letters in correct position (Green)
-    present_letters = set()     # Letters in word, wrong position (Yellow)
-    absent_letters = set()      # Letters not in word (Gray)
-    # For each position, a set of letters that were yellow in that specific position
-    yellow_misplaced = [set() for _ in range(5)]
+    # Everything learned from feedback so far, applied to the candidates as bitset queries
+    constraints = Constraints()
+    index = _index_covering(possible_words)
+    candidates_mask = index.mask_for(possible_words)
     
     # Track all tried letters
     tried_letters = set()
@@ -360,16 +1920,15 @@ def main():
         
         # Show current knowledge
         if guess_num > 1:
-            known_str = ['_'] * 5
-            for i, letter in enumerate(known_letters):
-                if letter:
-                    known_str[i] = letter.upper()
+            known_str = [letter.upper() if letter else '_' for letter in constraints.known_letters()]
+            present_letters = constraints.present_letters()
+            absent_letters = constraints.absent_letters()
             
             print(f"Known positions (Green): {' '.join(known_str)}")
             if present_letters:
-                print(f"Present letters (Yellow): {', '.join(sorted(present_letters)).upper()}")
+                print(f"Present letters (Yellow): {', '.join(present_letters).upper()}")
             if absent_letters:
-                print(f"Absent letters (Gray): {', '.join(sorted(absent_letters)).upper()}")
+                print(f"Absent letters (Gray): {', '.join(absent_letters).upper()}")
 
         suggested_guess = suggest_next_guess(possible_words, tried_letters)
         if guess_num == 1: # For the first guess, suggest a common starter
@@ -403,7 +1962,8 @@ def main():
             print(f"\nCongratulations! You found the word: {guess.upper()}")
             break
 
-        possible_words = filter_words(possible_words, guess, feedback, known_letters, present_letters, absent_letters, yellow_misplaced)
+        candidates_mask = constraints.merge(guess, feedback).compile(index, candidates_mask)
+        possible_words = index.words_for(candidates_mask)
 
         if guess_num == 6 and feedback != "GGGGG":
             print("\nGame over! Word not found within 6 guesses.")
@@ -15,13 +15,18 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // New elements for settings
     const excludePastWordsCheckbox = document.getElementById('excludePastWordsCheckbox');
+    const hardModeCheckbox = document.getElementById('hardModeCheckbox');
+    const dictionarySelect = document.getElementById('dictionarySelect');
     const wordListInfoEl = document.getElementById('wordListInfo');
 
+    // Word length of the current game's dictionary (set by Flask templating, updated on reset)
+    let wordLength = parseInt(userGuessInput.dataset.wordLength) || 5;
+
 
     let currentFeedback = ['X', 'X', 'X', 'X', 'X'];
     let feedbackBoxElements = [];
 
-    function createFeedbackBoxes(guessLength = 5) {
+    function createFeedbackBoxes(guessLength = wordLength) {
         feedbackBoxesContainer.innerHTML = '';
         feedbackBoxElements = [];
         currentFeedback = Array(guessLength).fill('X');
@@ -33,8 +38,8 @@ document.addEventListener('DOMContentLoaded', () => {
             box.textContent = '';
 
             box.addEventListener('click', () => {
-                if (!userGuessInput.value || userGuessInput.value.length !== 5) {
-                    showMessage("Enter a 5-letter guess first.");
+                if (!userGuessInput.value || userGuessInput.value.length !== wordLength) {
+                    showMessage(`Enter a ${wordLength}-letter guess first.`);
                     return;
                 }
                 const index = parseInt(box.dataset.index);
@@ -61,9 +66,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
     userGuessInput.addEventListener('input', () => {
         const guess = userGuessInput.value.toUpperCase();
-        userGuessInput.value = guess.substring(0, 5); // Ensure only 5 chars
+        userGuessInput.value = guess.substring(0, wordLength); // Ensure only wordLength chars
 
-        for (let i = 0; i < 5; i++) {
+        for (let i = 0; i < wordLength; i++) {
             if (feedbackBoxElements[i]) {
                 feedbackBoxElements[i].textContent = guess[i] || '';
                 if (!guess[i]) {
@@ -79,8 +84,8 @@ document.addEventListener('DOMContentLoaded', () => {
         const guess = userGuessInput.value.toLowerCase();
         const feedbackString = currentFeedback.join('');
 
-        if (guess.length !== 5 || !guess.match(/^[a-z]+$/i)) {
-            showMessage("Please enter a valid 5-letter guess.");
+        if (guess.length !== wordLength || !guess.match(/^[a-z]+$/i)) {
+            showMessage(`Please enter a valid ${wordLength}-letter guess.`);
             return;
         }
 
@@ -127,13 +132,15 @@ document.addEventListener('DOMContentLoaded', () => {
         if (!confirm("Are you sure you want to start a new game? This will apply current settings.")) return;
         
         const excludePast = excludePastWordsCheckbox.checked;
+        const hardMode = hardModeCheckbox.checked;
+        const dictionary = dictionarySelect.value;
         showMessage("Resetting game...");
 
         try {
             const response = await fetch('/reset_game', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ exclude_past_words: excludePast }) // Send the setting
+                body: JSON.stringify({ exclude_past_words: excludePast, hard_mode: hardMode, dictionary: dictionary }) // Send the settings
             });
             const data = await response.json();
             
@@ -154,9 +161,11 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
-    excludePastWordsCheckbox.addEventListener('change', () => {
-        // Inform user that they need to start a new game for the setting to take effect.
-        showMessage("Word list setting changed. Click 'New Game' to apply this setting.");
+    [excludePastWordsCheckbox, hardModeCheckbox, dictionarySelect].forEach(control => {
+        control.addEventListener('change', () => {
+            // Inform user that they need to start a new game for the setting to take effect.
+            showMessage("Setting changed. Click 'New Game' to apply this setting.");
+        });
     });
 
     function updateUI(data) {
@@ -168,13 +177,8 @@ document.addEventListener('DOMContentLoaded', () => {
         if (data.present_letters_display) presentLettersDisplayEl.textContent = data.present_letters_display;
         if (data.absent_letters_display) absentLettersDisplayEl.textContent = data.absent_letters_display;
 
-        if (data.possible_words_sample) {
-            possibleWordsSampleEl.innerHTML = ''; // Clear previous
-            data.possible_words_sample.forEach(word => {
-                const span = document.createElement('span');
-                span.textContent = word;
-                possibleWordsSampleEl.appendChild(span);
-            });
+        if (data.possible_words_count !== undefined) {
+            loadCandidates(); // The word list itself is fetched separately to keep responses small
         }
         if (data.message && !(data.solved || data.game_over)) { // Don't overwrite solved/game over message immediately
             showMessage(data.message);
@@ -184,11 +188,38 @@ document.addEventListener('DOMContentLoaded', () => {
         if (data.hasOwnProperty('exclude_past_words_setting')) {
             excludePastWordsCheckbox.checked = data.exclude_past_words_setting;
         }
+        if (data.hasOwnProperty('hard_mode_setting')) {
+            hardModeCheckbox.checked = data.hard_mode_setting;
+        }
+        if (data.dictionary) {
+            dictionarySelect.value = data.dictionary;
+        }
+        if (data.word_length && data.word_length !== wordLength) {
+            wordLength = data.word_length;
+            userGuessInput.maxLength = wordLength;
+            createFeedbackBoxes();
+        }
         if (data.word_list_info) {
             wordListInfoEl.textContent = data.word_list_info;
         }
     }
 
+    async function loadCandidates() {
+        try {
+            const response = await fetch('/api/candidates?offset=0&limit=200&sort=alpha');
+            const page = await response.json();
+            if (page.error) return;
+            possibleWordsSampleEl.innerHTML = ''; // Clear previous
+            page.words.forEach(word => {
+                const span = document.createElement('span');
+                span.textContent = word;
+                possibleWordsSampleEl.appendChild(span);
+            });
+        } catch (error) {
+            console.error("Candidate fetch error:", error);
+        }
+    }
+
     function showMessage(msg) {
         messageAreaEl.textContent = msg;
     }
@@ -0,0 +1,144 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from metrics import inc
+from solver_logic import (
+    suggest_next_guess,
+    cached_suggestion,
+    cache_suggestion,
+    WordIndex,
+    WordListWatcher,
+    RETAINED_SNAPSHOTS,
+    DICTIONARIES
+)
+
+# Runs expensive suggestion strategies in a process pool so a slow scoring pass
+# never blocks a request handler for long. Each request waits at most `timeout`
+# seconds; past that it gets the cheap frequency heuristic immediately, and the
+# worker's result, when it arrives, fills the suggestion cache so the next
+# request for the same candidate set gets the full answer.
+# Games keep the index they started on across word list reloads, so jobs name
+# it by digest. A worker only knows the word lists it has read from the files;
+# when it doesn't have a game's index it answers None, and the job is resent
+# with the word list itself (within the same deadline), which the worker keeps.
+
+OFFLOADED_STRATEGIES = {"entropy", "minimax"}
+# Request handlers and the word list watcher are threads, and forking a
+# threaded process can copy a held lock into the child; workers start from a
+# clean forkserver process instead (spawn where there is no forkserver).
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Word list snapshots seen by this worker process, refreshed per job (never in the background)
+_WORKER_WORD_LISTS = WordListWatcher(interval=0)
+_WORKER_INDEXES = {}  # digest -> WordIndex built from words the parent sent
+
+def _init_worker(dictionaries):
+    # Spawned workers don't see dictionaries registered at runtime in the parent
+    DICTIONARIES.update(dictionaries)
+
+def _worker_index(dictionary, index_digest, words=None):
+    """The index with this digest (built from words if given and needed), or None if the worker has none."""
+    index = _WORKER_INDEXES.get(index_digest)
+    if index is not None:
+        return index
+    word_lists = _WORKER_WORD_LISTS
+    index = word_lists.index_for(dictionary, index_digest)
+    if index is None and word_lists.refresh():
+        index = word_lists.index_for(dictionary, index_digest)
+    if index is not None:
+        return index
+    if words is None:
+        return None
+    if len(_WORKER_INDEXES) >= RETAINED_SNAPSHOTS:
+        _WORKER_INDEXES.clear()
+    index = _WORKER_INDEXES[index_digest] = WordIndex(words)
+    return index
+
+def _suggest_in_worker(dictionary, index_digest, candidates_mask, strategy, hard_mode, words=None):
+    """Worker side: decode the candidate bitmask and score with no time budget (the parent enforces it)."""
+    index = _worker_index(dictionary, index_digest, words)
+    if index is None:
+        return None
+    return suggest_next_guess(index.words_for(candidates_mask), strategy=strategy, hard_mode=hard_mode,
+                              index=index, time_budget=float('inf'))
+
+
+class SuggestionPool:
+    """Lazily started, per-process pool for expensive suggestion strategies."""
+
+    def __init__(self, processes=2, timeout=0.25):
+        self.processes = processes
+        self.timeout = timeout
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created on first use in each process, so a pre-fork master never owns one
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context(_START_METHOD),
+                    initializer=_init_worker, initargs=(dict(DICTIONARIES),)
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            self._executor = None
+
+    def suggest(self, dictionary, index, possible_words, candidates_mask, strategy, hard_mode=False, on_fallback=None):
+        """
+        Suggestion for a game, computed inline for cheap strategies and in the pool for expensive ones.
+        index is the game's WordIndex (the one candidates_mask is over).
+        on_fallback is called when the answer is the frequency heuristic standing in for a slow or failed worker.
+        """
+        if strategy not in OFFLOADED_STRATEGIES or not self.processes or not possible_words:
+            return suggest_next_guess(possible_words, strategy=strategy, hard_mode=hard_mode, index=index)
+
+        suggestion = cached_suggestion(index, candidates_mask, strategy, hard_mode)
+        if suggestion is not None:
+            inc("suggestion_pool_results", outcome="cached")
+            return suggestion
+
+        deadline = time.monotonic() + self.timeout
+        try:
+            future = self._get_executor().submit(_suggest_in_worker, dictionary, index.digest, candidates_mask,
+                                                 strategy, hard_mode)
+            suggestion = future.result(timeout=self.timeout)
+            if suggestion is None:
+                # The game started on word lists the worker hasn't seen: send them along
+                future = self._get_executor().submit(_suggest_in_worker, dictionary, index.digest, candidates_mask,
+                                                     strategy, hard_mode, index.words)
+                suggestion = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            # Too slow for this request: keep the job running and let it fill the cache
+            def fill_cache(done):
+                if not done.cancelled() and done.exception() is None:
+                    cache_suggestion(index, candidates_mask, strategy, hard_mode, done.result())
+            future.add_done_callback(fill_cache)
+            inc("suggestion_pool_results", outcome="timeout")
+            if on_fallback is not None:
+                on_fallback()
+            return suggest_next_guess(possible_words, strategy="frequency", hard_mode=hard_mode, index=index)
+        except BrokenProcessPool:
+            self._reset_executor()
+            inc("suggestion_pool_results", outcome="broken")
+            if on_fallback is not None:
+                on_fallback()
+            return suggest_next_guess(possible_words, strategy="frequency", hard_mode=hard_mode, index=index)
+
+        cache_suggestion(index, candidates_mask, strategy, hard_mode, suggestion)
+        inc("suggestion_pool_results", outcome="worker")
+        return suggestion
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
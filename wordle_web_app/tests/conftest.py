@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules import each other by name and open words.txt relative to
+# the working directory, so tests run as if from wordle_web_app/.
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+@pytest.fixture(autouse=True)
+def _app_dir(monkeypatch):
+    monkeypatch.chdir(APP_DIR)
@@ -0,0 +1,28 @@
+import random
+
+from solver_logic import Constraints, decode_pattern, feedback_pattern, filter_words, get_word_index
+
+def test_compiled_constraints_match_filter_words():
+    index = get_word_index()
+    words = list(index.words)
+    rng = random.Random(0)
+    for game in range(300):
+        answer = rng.choice(words)
+        constraints = Constraints()
+        mask = index.all_mask
+        remaining = words
+        for _ in range(rng.randint(1, 5)):
+            guess = rng.choice(words)
+            feedback = decode_pattern(feedback_pattern(guess, answer), 5)
+            if game % 3 == 0:
+                feedback = "".join(rng.sample(feedback, len(feedback)))  # Hand-typed, not Wordle's order
+            # Round-trips through the serialized form, as the app's game state does
+            constraints = Constraints.from_bytes(constraints.merge(guess, feedback).to_bytes())
+            mask = constraints.compile(index, mask)
+            remaining = filter_words(remaining, guess, feedback, [None] * 5, set(), set(), [set() for _ in range(5)])
+            assert sorted(index.words_for(mask)) == sorted(remaining), (answer, guess, feedback)
+
+def test_contradicting_green_leaves_no_candidates():
+    index = get_word_index()
+    constraints = Constraints().merge("crane", "XXXXX").merge("crane", "GXXXX")
+    assert constraints.compile(index) == 0
@@ -0,0 +1,12 @@
+from solver_logic import apply_feedback_multi, get_word_index
+from test_reverse_query import _boards, _filter_words_answers
+
+def test_apply_feedback_multi_matches_filter_words():
+    index = get_word_index()
+    words = list(index.words)
+    for board in _boards(words, count=100, seed=2):
+        feedbacks = [feedback for _, feedback in board[:1]] * 3 + [None]
+        masks = apply_feedback_multi(index, [index.all_mask] * 4, board[0][0], feedbacks)
+        assert masks[3] == index.all_mask
+        for mask in masks[:3]:
+            assert sorted(index.words_for(mask)) == _filter_words_answers(words, board[:1]), board[0]
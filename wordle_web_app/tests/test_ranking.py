@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from solver_logic import (
+    _rank_by_frequency_numpy,
+    _rank_by_frequency_python,
+    get_word_index,
+    UNIQUENESS_WEIGHT,
+    np
+)
+
+pytestmark = pytest.mark.skipif(np is None, reason="the vectorized scorer needs numpy")
+
+def _assert_same_ranking(words, index, limit=None):
+    expected = _rank_by_frequency_python(words, UNIQUENESS_WEIGHT)[:limit]
+    assert _rank_by_frequency_numpy(words, UNIQUENESS_WEIGHT, index, limit) == expected
+
+def test_numpy_ranking_matches_python_on_full_list():
+    index = get_word_index()
+    _assert_same_ranking(list(index.words), index)
+    _assert_same_ranking(list(index.words), index, limit=3)
+
+@pytest.mark.parametrize("size", [33, 40, 500, 1000])
+def test_numpy_ranking_matches_python_on_random_subsets(size):
+    index = get_word_index()
+    rng = random.Random(size)
+    for _ in range(5):
+        _assert_same_ranking(rng.sample(index.words, size), index)
+
+def test_numpy_ranking_defers_duplicates_to_python():
+    index = get_word_index()
+    assert _rank_by_frequency_numpy(["crane", "crane", "slate"], UNIQUENESS_WEIGHT, index) is None
@@ -0,0 +1,51 @@
+import json
+import random
+
+from solver_logic import decode_pattern, feedback_pattern, filter_words, get_word_list
+from reverse_query import query_boards, stream_queries
+
+def _filter_words_answers(words, board):
+    """Reference answers: the board's guesses applied one by one with filter_words."""
+    for guess, feedback in board:
+        words = filter_words(words, guess, feedback, [None] * 5, set(), set(), [set() for _ in range(5)])
+    return sorted(words)
+
+def _boards(words, count=300, seed=0):
+    """Real boards, hand-typed boards (shuffled feedback) and the known gray-before-yellow cases."""
+    rng = random.Random(seed)
+    boards = [[["speed", "XXXYY"]], [["eerie", "XYXXX"]], [["crane", "XYXXG"], ["sloth", "XXXXX"]]]
+    for _ in range(count):
+        answer = rng.choice(words)
+        board = []
+        for _ in range(rng.randint(1, 4)):
+            guess = rng.choice(words)
+            feedback = decode_pattern(feedback_pattern(guess, answer), 5)
+            if rng.random() < 0.3:
+                feedback = "".join(rng.sample(feedback, len(feedback)))
+            board.append([guess, feedback])
+        boards.append(board)
+    return boards
+
+def test_query_boards_matches_filter_words():
+    words = get_word_list()
+    boards = _boards(words)
+    results = query_boards(boards)
+    assert len(results) == len(boards)
+    for board, result in zip(boards, results):
+        expected = _filter_words_answers(words, board)
+        assert result["count"] == len(expected), board
+        assert result["words"] == expected, board
+
+def test_query_boards_honours_exclude_past():
+    boards = _boards(get_word_list(), count=50, seed=1)
+    words = get_word_list(exclude_past=True)
+    for board, result in zip(boards, query_boards(boards, exclude_past=True)):
+        assert result["words"] == _filter_words_answers(words, board), board
+
+def test_stream_queries_keeps_order_and_reports_bad_lines():
+    lines = ['{"id": 1, "board": [["speed", "XXXYY"]]}', 'not json', '[["crane", "XQXXX"]]', '[]']
+    output = [json.loads(line) for line in stream_queries(lines, max_words=0, processes=1)]
+    assert output[0]["id"] == 1
+    assert output[0]["count"] == len(_filter_words_answers(get_word_list(), [["speed", "XXXYY"]]))
+    assert "error" in output[1] and "error" in output[2]
+    assert output[3] == {"count": len(get_word_list())}
@@ -0,0 +1,174 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+from multiprocessing import shared_memory
+
+from solver_logic import get_word_list, WordIndex, SUGGESTION_STRATEGIES, PATTERN_MATRIX_STRATEGIES, np
+from simulate import play_game, percentile, MAX_GUESSES
+
+# Head-to-head comparison of suggestion strategies.
+# Every (strategy, answer) pair is one job. Jobs fan out over a process pool
+# whose workers build their WordIndex from the full word list in a shared
+# memory block (and read the pattern matrix from its memory-mapped .npy file), results are appended to a JSONL or
+# CSV file as they arrive, and a rerun skips pairs already in that file so an
+# interrupted tournament resumes where it stopped.
+
+RESULT_FIELDS = ("strategy", "answer", "guesses", "solved", "filter_ms", "suggest_ms")
+
+def _is_csv(path):
+    return path.lower().endswith(".csv")
+
+def _repair_partial_line(path):
+    """Truncates a trailing partial line left by an interrupted run."""
+    with open(path, 'rb+') as file:
+        data = file.read()
+        if data and not data.endswith(b"\n"):
+            file.truncate(data.rfind(b"\n") + 1)
+
+def read_results(path):
+    """Reads all complete result rows from a results file."""
+    if not os.path.exists(path):
+        return []
+    _repair_partial_line(path)
+    rows = []
+    with open(path, 'r', newline='') as file:
+        if _is_csv(path):
+            for row in csv.DictReader(file):
+                row["guesses"] = int(row["guesses"]) if row["guesses"] else None
+                row["solved"] = row["solved"] == "True"
+                row["filter_ms"] = float(row["filter_ms"])
+                row["suggest_ms"] = float(row["suggest_ms"])
+                rows.append(row)
+        else:
+            for line in file:
+                if line.strip():
+                    rows.append(json.loads(line))
+    return rows
+
+# Worker process state, set once per process by _init_worker
+_WORKER = {}
+
+def _init_worker(shm_name, n_words, word_length, words_filename, start_mask, starter, use_pattern_matrix):
+    # Attach to the parent's shared word list instead of re-reading or unpickling it
+    shm = shared_memory.SharedMemory(name=shm_name)
+    raw = bytes(shm.buf[:n_words * word_length]).decode('ascii')
+    shm.close()
+    words = tuple(raw[i:i + word_length] for i in range(0, len(raw), word_length))
+    # Same list and source file as the parent's index, so the same pattern matrix file
+    index = WordIndex(words, source_path=os.path.abspath(words_filename))
+    _WORKER["index"] = index
+    _WORKER["word_list"] = tuple(index.words_for(start_mask))
+    _WORKER["starter"] = starter
+    if use_pattern_matrix:
+        index.pattern_matrix()
+
+def _play_job(job):
+    strategy, answer = job
+    guesses, filter_times, suggest_times = play_game(answer, _WORKER["word_list"], strategy, _WORKER["starter"],
+                                                     index=_WORKER["index"])
+    return {
+        "strategy": strategy,
+        "answer": answer,
+        "guesses": guesses,
+        "solved": guesses is not None,
+        "filter_ms": sum(filter_times) * 1000,
+        "suggest_ms": sum(suggest_times) * 1000
+    }
+
+def run_tournament(strategies, answers, output, words_filename="words.txt", exclude_past=False,
+                   starter="crane", processes=None):
+    """Plays every (strategy, answer) job not yet in output, appending results as they finish."""
+    done = {(row["strategy"], row["answer"]) for row in read_results(output)}
+    jobs = [(strategy, answer) for strategy in strategies for answer in answers if (strategy, answer) not in done]
+    if not jobs:
+        return 0
+
+    # Workers index every word (all are allowed guesses) and start games from the exclude_past list
+    all_words = get_word_list(filename=words_filename, exclude_past=False)
+    start_words = set(get_word_list(filename=words_filename, exclude_past=exclude_past))
+    start_mask = sum(1 << i for i, word in enumerate(all_words) if word in start_words)
+    word_length = len(all_words[0])
+    packed = "".join(all_words).encode('ascii')
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(packed)))
+    shm.buf[:len(packed)] = packed
+    init_args = (shm.name, len(all_words), word_length, words_filename, start_mask, starter,
+                 np is not None and bool(PATTERN_MATRIX_STRATEGIES.intersection(strategies)))
+
+    is_csv = _is_csv(output)
+    write_header = is_csv and not os.path.exists(output)
+    try:
+        with open(output, 'a', newline='') as file, \
+                multiprocessing.Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+            writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS) if is_csv else None
+            if write_header:
+                writer.writeheader()
+            chunksize = max(1, min(32, len(jobs) // ((processes or multiprocessing.cpu_count()) * 8)))
+            for result in pool.imap_unordered(_play_job, jobs, chunksize):
+                if writer:
+                    writer.writerow(result)
+                else:
+                    file.write(json.dumps(result) + "\n")
+                file.flush()  # Each finished job survives an interruption
+    finally:
+        shm.close()
+        shm.unlink()
+    return len(jobs)
+
+def summarize(rows):
+    """Per-strategy summary of result rows."""
+    by_strategy = {}
+    for row in rows:
+        by_strategy.setdefault(row["strategy"], []).append(row)
+
+    summary = {}
+    for strategy, results in sorted(by_strategy.items()):
+        solved = [row["guesses"] for row in results if row["solved"]]
+        histogram = {str(n): solved.count(n) for n in range(1, MAX_GUESSES + 1)}
+        suggest_ms = sorted(row["suggest_ms"] for row in results)
+        summary[strategy] = {
+            "games": len(results),
+            "failure_rate": 1 - len(solved) / len(results),
+            "average_guesses": sum(solved) / len(solved) if solved else None,
+            "histogram": histogram,
+            "suggest_ms_per_game_p50": percentile(suggest_ms, 0.50),
+            "suggest_ms_per_game_p95": percentile(suggest_ms, 0.95)
+        }
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a strategy tournament over the answer list.")
+    parser.add_argument("strategies", nargs="*", default=["frequency", "frequency_top1", "entropy"],
+                        help=f"strategies to compare (available: {', '.join(sorted(SUGGESTION_STRATEGIES))})")
+    parser.add_argument("--output", default="tournament_results.jsonl", help="results file (.jsonl or .csv); resumed if it exists")
+    parser.add_argument("--words", default="words.txt", help="word list file (also the answer list)")
+    parser.add_argument("--exclude-past", action="store_true", help="start games without past answers")
+    parser.add_argument("--starter", default="crane", help="fixed first guess; 'none' lets each strategy choose")
+    parser.add_argument("--sample", type=int, default=0, help="play only this many random answers")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for --sample")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.strategies if name not in SUGGESTION_STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+
+    answers = list(get_word_list(filename=args.words, exclude_past=args.exclude_past))  # The list games start from
+    if args.sample:
+        answers = random.Random(args.seed).sample(answers, min(args.sample, len(answers)))
+    starter = None if args.starter.lower() == "none" else args.starter.lower()
+
+    played = run_tournament(args.strategies, answers, args.output, args.words, args.exclude_past, starter, args.processes)
+    print(f"Played {played} new games, results in {args.output}")
+
+    answer_set = set(answers)
+    rows = [row for row in read_results(args.output) if row["strategy"] in args.strategies and row["answer"] in answer_set]
+    for strategy, stats in summarize(rows).items():
+        average = f"{stats['average_guesses']:.3f}" if stats['average_guesses'] is not None else "n/a"
+        print(f"{strategy:>16}: {stats['games']} games, avg {average} guesses, "
+              f"failure rate {stats['failure_rate']:.2%}, suggest p50 {stats['suggest_ms_per_game_p50']:.2f} ms/game")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+# Production entry point, e.g.:
+#   gunicorn --preload --workers 4 wsgi:app
+# Requests from one player can land on any worker, so games are kept in the
+# shared SQLite store unless WORDLE_GAME_STORE says otherwise (the in-process
+# "memory" store is only safe with a single worker).
+# With --preload this module is imported once in the master process, so every
+# dictionary's word lists, bitset index and memory-mapped pattern matrix are
+# built before the workers fork and shared copy-on-write. Each worker starts
+# its own suggestion process pool lazily on first use.
+# Running `python compile_index.py --patterns` as a build step lets the master
+# memory-map the compiled index files instead of parsing the text files.
+import os
+
+from app import create_app, preload_word_indexes
+
+preload_word_indexes()
+app = create_app({'GAME_STORE': os.environ.get('WORDLE_GAME_STORE', 'sqlite')})